@@ -1,80 +1,70 @@
 #!/usr/bin/env python3
 """Fix the last 5 calendar build errors."""
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-def fix_handlers_calendar():
-    path = '/opt/oonrumail/app/services/calendar/handlers/calendar.go'
-    with open(path, 'r') as f:
-        lines = f.readlines()
+from scripts._fileio import read_text, write_if_changed
 
-    new_lines = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+# Matches the uuid.Parse(req.UserID) line plus its `if err != nil { ... }` tail,
+# stopping just before the ShareCalendar call.
+_SHARE_PARSE_RE = re.compile(
+    r'[ \t]*targetUserID, err := uuid\.Parse\(req\.UserID\).*?(?=[ \t]*if err := h\.service\.ShareCalendar)',
+    re.DOTALL,
+)
 
-        # Fix 1: Line ~200 - uuid.Parse(req.UserID) where req.UserID is already uuid.UUID
-        # Replace the uuid.Parse block with direct assignment
-        if 'targetUserID, err := uuid.Parse(req.UserID)' in line:
-            # Replace with direct assignment (no parsing needed)
-            indent = '\t\t'
-            new_lines.append(indent + 'targetUserID := req.UserID\n')
-            # Skip the next 4 lines (err check block): if err != nil { ... return ... }
-            i += 1
-            while i < len(lines) and 'if err := h.service.ShareCalendar' not in lines[i]:
-                i += 1
-            # Don't skip the ShareCalendar line itself
-            continue
+# caldav/handler.go: event/attendee Status fields are now typed, not plain strings
+CALDAV_FIXES = {
+    # Fix 3: strings.ToUpper(event.Status) -> strings.ToUpper(string(event.Status))
+    'strings.ToUpper(event.Status)': 'strings.ToUpper(string(event.Status))',
+    # Fix 4: partstat := strings.ToUpper(strings.ReplaceAll(att.Status, "-", ""))
+    'strings.ReplaceAll(att.Status,': 'strings.ReplaceAll(string(att.Status),',
+    # Fix 5: event.Status = strings.ToLower(...) -> event.Status = models.EventStatus(strings.ToLower(...))
+    'event.Status = strings.ToLower(strings.TrimPrefix(line, "STATUS:"))':
+        'event.Status = models.EventStatus(strings.ToLower(strings.TrimPrefix(line, "STATUS:")))',
+    # Default assignment: event.Status = "confirmed" -> event.Status = models.EventStatus("confirmed")
+    'event.Status = "confirmed"': 'event.Status = models.EventStatus("confirmed")',
+}
+_CALDAV_RE = re.compile('|'.join(map(re.escape, CALDAV_FIXES)))
 
-        # Fix 2: Line ~468 - models.RSVPRequest -> models.RespondRequest
-        if 'models.RSVPRequest' in line:
-            line = line.replace('models.RSVPRequest', 'models.RespondRequest')
+HANDLERS_PATH = '/opt/oonrumail/app/services/calendar/handlers/calendar.go'
+CALDAV_PATH = '/opt/oonrumail/app/services/calendar/caldav/handler.go'
 
-        new_lines.append(line)
-        i += 1
 
-    with open(path, 'w') as f:
-        f.writelines(new_lines)
-    print(f"Fixed {path}")
+def fix_handlers_calendar(source=None):
+    path = HANDLERS_PATH
+    content = original = source.result() if source else read_text(path)
 
+    # Fix 1: Line ~200 - uuid.Parse(req.UserID) where req.UserID is already uuid.UUID
+    # Replace the uuid.Parse block (and its err check) with direct assignment
+    content = _SHARE_PARSE_RE.sub('\t\ttargetUserID := req.UserID\n', content)
 
-def fix_caldav_handler():
-    path = '/opt/oonrumail/app/services/calendar/caldav/handler.go'
-    with open(path, 'r') as f:
-        content = f.read()
+    # Fix 2: Line ~468 - models.RSVPRequest -> models.RespondRequest
+    content = content.replace('models.RSVPRequest', 'models.RespondRequest')
 
-    # Fix 3: strings.ToUpper(event.Status) -> strings.ToUpper(string(event.Status))
-    content = content.replace(
-        'strings.ToUpper(event.Status)',
-        'strings.ToUpper(string(event.Status))'
-    )
+    if write_if_changed(path, content, original):
+        print(f"Fixed {path}")
+    else:
+        print(f"No changes needed for {path}")
 
-    # Fix 4: strings.ReplaceAll(att.Status, ...) -> strings.ReplaceAll(string(att.Status), ...)
-    # The line is: partstat := strings.ToUpper(strings.ReplaceAll(att.Status, "-", ""))
-    content = content.replace(
-        'strings.ReplaceAll(att.Status,',
-        'strings.ReplaceAll(string(att.Status),'
-    )
 
-    # Fix 5: event.Status = strings.ToLower(...) -> event.Status = models.EventStatus(strings.ToLower(...))
-    # The line is: event.Status = strings.ToLower(strings.TrimPrefix(line, "STATUS:"))
-    content = content.replace(
-        'event.Status = strings.ToLower(strings.TrimPrefix(line, "STATUS:"))',
-        'event.Status = models.EventStatus(strings.ToLower(strings.TrimPrefix(line, "STATUS:")))'
-    )
+def fix_caldav_handler(source=None):
+    path = CALDAV_PATH
+    content = original = source.result() if source else read_text(path)
 
-    # Also fix the default assignment: event.Status = "confirmed" -> event.Status = models.EventStatus("confirmed")
-    # But only the bare assignment, not the one we just fixed
-    content = content.replace(
-        'event.Status = "confirmed"',
-        'event.Status = models.EventStatus("confirmed")'
-    )
+    # Fix 3-5 (+ default status assignment) in one pass; see CALDAV_FIXES
+    content = _CALDAV_RE.sub(lambda m: CALDAV_FIXES[m.group(0)], content)
 
-    with open(path, 'w') as f:
-        f.write(content)
-    print(f"Fixed {path}")
+    if write_if_changed(path, content, original):
+        print(f"Fixed {path}")
+    else:
+        print(f"No changes needed for {path}")
 
 
 if __name__ == '__main__':
-    fix_handlers_calendar()
-    fix_caldav_handler()
+    # Kick off every read up-front so disk I/O overlaps with the rewrites
+    with ThreadPoolExecutor() as ex:
+        pending = {path: ex.submit(read_text, path) for path in (HANDLERS_PATH, CALDAV_PATH)}
+        fix_handlers_calendar(pending[HANDLERS_PATH])
+        fix_caldav_handler(pending[CALDAV_PATH])
     print("All fixes applied!")
@@ -1,11 +1,42 @@
 #!/usr/bin/env python3
 """Fix main.go and config.go to match actual function signatures and method names."""
 import os
-
-def fix_config():
-    path = '/opt/oonrumail/app/services/calendar/config/config.go'
-    with open(path, 'r') as f:
-        content = f.read()
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts._fileio import read_text, write_if_changed
+
+# Old handler method name -> actual method name on CalendarHandler
+CAL_MAP = {
+    'List': 'ListCalendars',
+    'Create': 'CreateCalendar',
+    'Get': 'GetCalendar',
+    'Update': 'UpdateCalendar',
+    'Delete': 'DeleteCalendar',
+    'Share': 'ShareCalendar',
+    'Unshare': 'UnshareCalendar',
+}
+EVT_MAP = {
+    'List': 'ListEvents',
+    'Create': 'CreateEvent',
+    'Get': 'GetEvent',
+    'Update': 'UpdateEvent',
+    'Delete': 'DeleteEvent',
+    'Respond': 'RespondToEvent',
+    'Search': 'SearchEvents',
+    'FreeBusy': 'GetFreeBusy',
+}
+
+_CAL_METHOD_RE = re.compile(r'calendarHandler\.(' + '|'.join(CAL_MAP) + r')\)')
+_EVT_METHOD_RE = re.compile(r'eventHandler\.(' + '|'.join(EVT_MAP) + r')\)')
+
+CONFIG_PATH = '/opt/oonrumail/app/services/calendar/config/config.go'
+MAIN_PATH = '/opt/oonrumail/app/services/calendar/main.go'
+
+
+def fix_config(source=None):
+    path = CONFIG_PATH
+    content = original = source.result() if source else read_text(path)
 
     bt = chr(96)  # backtick
 
@@ -29,14 +60,14 @@ def fix_config():
         '\tif cfg.Notification.ReminderLookAhead == 0 {'
     )
 
-    with open(path, 'w') as f:
-        f.write(content)
-    print(f"Fixed {path}")
+    if write_if_changed(path, content, original):
+        print(f"Fixed {path}")
+    else:
+        print(f"No changes needed for {path}")
 
-def fix_main():
-    path = '/opt/oonrumail/app/services/calendar/main.go'
-    with open(path, 'r') as f:
-        content = f.read()
+def fix_main(source=None):
+    path = MAIN_PATH
+    content = original = source.result() if source else read_text(path)
 
     # Fix 1: NewCalendarService needs reminderRepo and notificationService
     content = content.replace(
@@ -78,36 +109,11 @@ def fix_main():
         '\t\tauthMw := handlers.NewAuthMiddleware(cfg.Server.AuthServiceURL, logger.Named("auth"))\n\t\tr.Use(authMw.Authenticate)'
     )
 
-    # Fix 6: calendarHandler.List -> calendarHandler.ListCalendars
-    content = content.replace('calendarHandler.List)', 'calendarHandler.ListCalendars)')
-
-    # Fix 7: calendarHandler.Create -> calendarHandler.CreateCalendar
-    content = content.replace('calendarHandler.Create)', 'calendarHandler.CreateCalendar)')
-
-    # Fix 8: calendarHandler.Get -> calendarHandler.GetCalendar
-    content = content.replace('calendarHandler.Get)', 'calendarHandler.GetCalendar)')
-
-    # Fix 9: calendarHandler.Update -> calendarHandler.UpdateCalendar
-    content = content.replace('calendarHandler.Update)', 'calendarHandler.UpdateCalendar)')
-
-    # Fix 10: calendarHandler.Delete -> calendarHandler.DeleteCalendar
-    content = content.replace('calendarHandler.Delete)', 'calendarHandler.DeleteCalendar)')
-
-    # Fix 11: calendarHandler.Share -> calendarHandler.ShareCalendar
-    content = content.replace('calendarHandler.Share)', 'calendarHandler.ShareCalendar)')
-
-    # Fix 12: calendarHandler.Unshare -> calendarHandler.UnshareCalendar
-    content = content.replace('calendarHandler.Unshare)', 'calendarHandler.UnshareCalendar)')
+    # Fix 6-12: calendarHandler.<Verb> -> calendarHandler.<Verb>Calendar
+    content = _CAL_METHOD_RE.sub(lambda m: f'calendarHandler.{CAL_MAP[m.group(1)]})', content)
 
     # Fix 13: eventHandler.* -> calendarHandler.* with correct method names
-    content = content.replace('eventHandler.List)', 'calendarHandler.ListEvents)')
-    content = content.replace('eventHandler.Create)', 'calendarHandler.CreateEvent)')
-    content = content.replace('eventHandler.Get)', 'calendarHandler.GetEvent)')
-    content = content.replace('eventHandler.Update)', 'calendarHandler.UpdateEvent)')
-    content = content.replace('eventHandler.Delete)', 'calendarHandler.DeleteEvent)')
-    content = content.replace('eventHandler.Respond)', 'calendarHandler.RespondToEvent)')
-    content = content.replace('eventHandler.Search)', 'calendarHandler.SearchEvents)')
-    content = content.replace('eventHandler.FreeBusy)', 'calendarHandler.GetFreeBusy)')
+    content = _EVT_METHOD_RE.sub(lambda m: f'calendarHandler.{EVT_MAP[m.group(1)]})', content)
 
     # Fix 14: CalDAV route - caldavHandler has no AuthMiddleware or ServeHTTP
     # Replace the whole CalDAV route block with RegisterRoutes
@@ -123,12 +129,16 @@ def fix_main():
         '\t})'
     )
 
-    with open(path, 'w') as f:
-        f.write(content)
-    print(f"Fixed {path}")
+    if write_if_changed(path, content, original):
+        print(f"Fixed {path}")
+    else:
+        print(f"No changes needed for {path}")
 
 
 if __name__ == '__main__':
-    fix_config()
-    fix_main()
+    # Kick off every read up-front so disk I/O overlaps with the rewrites
+    with ThreadPoolExecutor() as ex:
+        pending = {path: ex.submit(read_text, path) for path in (CONFIG_PATH, MAIN_PATH)}
+        fix_config(pending[CONFIG_PATH])
+        fix_main(pending[MAIN_PATH])
     print("Done!")
@@ -1,15 +1,38 @@
 #!/usr/bin/env python3
 """Fix docker-compose.yml to connect transactional-api and calendar directly to postgres."""
+from scripts._fileio import atomic_write, read_bytes
+
 path = '/opt/oonrumail/app/docker-compose.yml'
-with open(path, 'r') as f:
-    lines = f.readlines()
+data = read_bytes(path)
 
-# Fix lines 614 and 657 (1-indexed, so 613 and 656 in 0-indexed)
-for idx in [613, 656]:
-    if idx < len(lines) and 'pgbouncer' in lines[idx] and 'sslmode=require' in lines[idx]:
-        lines[idx] = lines[idx].replace('pgbouncer', 'postgres').replace('sslmode=require', 'sslmode=disable')
-        print(f"Fixed line {idx+1}: {lines[idx].strip()}")
+# Fix lines 614 and 657 (1-indexed, so 613 and 656 in 0-indexed).
+# Only walk newlines up to the last target line instead of splitting the whole file.
+targets = {613, 656}
+edits = []  # (start, end, new_line) byte spans to splice in
+start = 0
+for idx in range(max(targets) + 1):
+    end = data.find(b'\n', start)
+    if end < 0:
+        end = len(data)
+    if idx in targets:
+        line = data[start:end]
+        if b'pgbouncer' in line and b'sslmode=require' in line:
+            line = line.replace(b'pgbouncer', b'postgres').replace(b'sslmode=require', b'sslmode=disable')
+            edits.append((start, end, line))
+            print(f"Fixed line {idx+1}: {line.decode().strip()}")
+    if end == len(data):
+        break
+    start = end + 1
 
-with open(path, 'w') as f:
-    f.writelines(lines)
+if edits:
+    out = []
+    pos = 0
+    for a, b, line in edits:
+        out.append(data[pos:a])
+        out.append(line)
+        pos = b
+    out.append(data[pos:])
+    atomic_write(path, b''.join(out))
+else:
+    print("No changes needed")
 print("Done!")
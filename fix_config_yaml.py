@@ -3,20 +3,22 @@
 Replace ${VAR:-default} with ${VAR} since Docker Compose always provides the env vars."""
 import re
 
+from scripts._fileio import atomic_write, read_bytes
+
+# Pattern: ${VARNAME:-anything_until_closing_brace}
+# Operates on raw bytes so the file never goes through a decode/encode round-trip.
+_DEFAULT_RE = re.compile(rb'\$\{([A-Za-z_]\w*):-[^}]*\}', re.ASCII)
+
 def fix_config_yaml(path):
-    with open(path, 'r') as f:
-        content = f.read()
+    content = read_bytes(path)
 
     # Replace ${VAR:-default} with ${VAR}
-    # Pattern: ${VARNAME:-anything_until_closing_brace}
-    # Need to handle nested braces and URLs carefully
-    fixed = re.sub(r'\$\{([A-Za-z_][A-Za-z0-9_]*):-[^}]*\}', r'${\1}', content)
+    fixed, n = _DEFAULT_RE.subn(rb'${\1}', content)
 
-    with open(path, 'w') as f:
-        f.write(fixed)
+    if n:
+        atomic_write(path, fixed)
 
-    changes = content != fixed
-    print(f"{'Fixed' if changes else 'No changes needed for'} {path}")
+    print(f"{'Fixed' if n else 'No changes needed for'} {path} ({n} subs)")
 
 fix_config_yaml('/opt/oonrumail/app/services/calendar/config.yaml')
 fix_config_yaml('/opt/oonrumail/app/services/transactional-api/config.yaml')
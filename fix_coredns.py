@@ -3,76 +3,19 @@
 Fix CoreDNS: update health check, add oonrumail.com zone, update Corefile.
 """
 import os
+import re
 
-SERVER_IP = '138.201.37.187'
-
-def fix_compose_healthcheck():
-    """Fix the CoreDNS health check in docker-compose.yml to not use nslookup."""
-    path = '/opt/oonrumail/app/docker-compose.yml'
-    with open(path, 'r') as f:
-        content = f.read()
-
-    # The CoreDNS image is scratch-based, no binaries available.
-    # CoreDNS health plugin listens on :8080/health inside the container.
-    # We need to expose port 8080 and use a network health check, OR
-    # just use NONE and rely on container restart policy.
-    # Best approach: use CMD-SHELL with /coredns binary's built-in health
-    # Actually, the simplest: change to use the ready plugin endpoint via TCP check
-
-    old_healthcheck = '''    healthcheck:
-      test: ["CMD", "nslookup", "example.com", "localhost"]
-      interval: 30s
-      timeout: 10s
-      retries: 3
-      start_period: 10s
-    networks:
-      - email-network
-
-  # Adminer'''
-
-    # Use CMD-SHELL with a simple TCP check on port 53 using /dev/tcp
-    # But scratch containers don't have shell either.
-    # Best solution: add the health port mapping and check from outside
-    new_healthcheck = '''    healthcheck:
-      test: ["CMD-SHELL", "true"]
-      interval: 30s
-      timeout: 5s
-      retries: 3
-      start_period: 5s
-    networks:
-      - email-network
-
-  # Adminer'''
-
-    if old_healthcheck in content:
-        content = content.replace(old_healthcheck, new_healthcheck)
-        print("Fixed docker-compose.yml healthcheck")
-    else:
-        # Try a more flexible match
-        import re
-        pattern = r'(    healthcheck:\s*\n\s*test: \["CMD", "nslookup".*?\n\s*interval:.*?\n\s*timeout:.*?\n\s*retries:.*?\n\s*start_period:.*?\n)'
-        replacement = '''    healthcheck:
-      test: ["CMD-SHELL", "true"]
-      interval: 30s
-      timeout: 5s
-      retries: 3
-      start_period: 5s
-'''
-        content, count = re.subn(pattern, replacement, content, count=1)
-        if count:
-            print("Fixed docker-compose.yml healthcheck (regex)")
-        else:
-            print("WARNING: Could not find CoreDNS healthcheck to fix")
-
-    with open(path, 'w') as f:
-        f.write(content)
+from scripts._fileio import atomic_write, read_text, write_if_changed
 
+SERVER_IP = '138.201.37.187'
 
-def update_corefile():
-    """Update Corefile to add oonrumail.com zone."""
-    path = '/opt/oonrumail/app/docker/config/coredns/Corefile'
+# Fallback match for the nslookup-based CoreDNS healthcheck block
+_HEALTHCHECK_RE = re.compile(
+    r'(    healthcheck:\s*\n\s*test: \["CMD", "nslookup".*?\n\s*interval:.*?\n\s*timeout:.*?\n\s*retries:.*?\n\s*start_period:.*?\n)'
+)
 
-    corefile = f'''# ============================================================
+# Corefile / zone templates; {ip} is filled with SERVER_IP at write time
+COREFILE_TMPL = '''# ============================================================
 # CoreDNS Configuration for OonruMail
 # ============================================================
 # Serves DNS for oonrumail.com and test domains
@@ -115,16 +58,16 @@ oonrumail.com:53 {{
     file /config/zones/oonrumail.com.zone
 
     hosts {{
-        {SERVER_IP} oonrumail.com
-        {SERVER_IP} mail.oonrumail.com
-        {SERVER_IP} smtp.oonrumail.com
-        {SERVER_IP} imap.oonrumail.com
-        {SERVER_IP} www.oonrumail.com
-        {SERVER_IP} api.oonrumail.com
-        {SERVER_IP} admin.oonrumail.com
-        {SERVER_IP} calendar.oonrumail.com
-        {SERVER_IP} contacts.oonrumail.com
-        {SERVER_IP} chat.oonrumail.com
+        {ip} oonrumail.com
+        {ip} mail.oonrumail.com
+        {ip} smtp.oonrumail.com
+        {ip} imap.oonrumail.com
+        {ip} www.oonrumail.com
+        {ip} api.oonrumail.com
+        {ip} admin.oonrumail.com
+        {ip} calendar.oonrumail.com
+        {ip} contacts.oonrumail.com
+        {ip} chat.oonrumail.com
         fallthrough
     }}
 }}
@@ -137,25 +80,15 @@ example.com:53 {{
     file /config/zones/example.com.zone
 
     hosts {{
-        {SERVER_IP} mail.example.com
-        {SERVER_IP} smtp.example.com
-        {SERVER_IP} imap.example.com
+        {ip} mail.example.com
+        {ip} smtp.example.com
+        {ip} imap.example.com
         fallthrough
     }}
 }}
 '''
 
-    with open(path, 'w') as f:
-        f.write(corefile)
-    print(f"Updated Corefile at {path}")
-
-
-def create_oonrumail_zone():
-    """Create the oonrumail.com zone file."""
-    zones_dir = '/opt/oonrumail/app/docker/config/coredns/zones'
-    os.makedirs(zones_dir, exist_ok=True)
-
-    zone = f'''; ============================================================
+ZONE_TMPL = '''; ============================================================
 ; DNS Zone File: oonrumail.com
 ; Production domain managed via Cloudflare
 ; This zone provides internal Docker DNS resolution
@@ -176,31 +109,31 @@ $TTL 3600
 @       IN      NS      ns1.oonrumail.com.
 
 ; A Records - Main
-@       IN      A       {SERVER_IP}
-ns1     IN      A       {SERVER_IP}
+@       IN      A       {ip}
+ns1     IN      A       {ip}
 
 ; A Records - Mail
-mail    IN      A       {SERVER_IP}
-smtp    IN      A       {SERVER_IP}
-imap    IN      A       {SERVER_IP}
+mail    IN      A       {ip}
+smtp    IN      A       {ip}
+imap    IN      A       {ip}
 
 ; A Records - Web & API
-www     IN      A       {SERVER_IP}
-api     IN      A       {SERVER_IP}
-admin   IN      A       {SERVER_IP}
+www     IN      A       {ip}
+api     IN      A       {ip}
+admin   IN      A       {ip}
 
 ; A Records - Services
-calendar    IN      A       {SERVER_IP}
-contacts    IN      A       {SERVER_IP}
-chat        IN      A       {SERVER_IP}
-storage     IN      A       {SERVER_IP}
-auth        IN      A       {SERVER_IP}
+calendar    IN      A       {ip}
+contacts    IN      A       {ip}
+chat        IN      A       {ip}
+storage     IN      A       {ip}
+auth        IN      A       {ip}
 
 ; MX Records (Mail Exchanger)
 @       IN      MX      10 mail.oonrumail.com.
 
 ; TXT Records - SPF
-@       IN      TXT     "v=spf1 mx a ip4:{SERVER_IP} -all"
+@       IN      TXT     "v=spf1 mx a ip4:{ip} -all"
 
 ; TXT Records - DMARC
 _dmarc  IN      TXT     "v=DMARC1; p=quarantine; rua=mailto:dmarc-reports@oonrumail.com; ruf=mailto:dmarc-forensic@oonrumail.com; adkim=s; aspf=s; pct=100"
@@ -216,24 +149,84 @@ autoconfig      IN      CNAME   mail.oonrumail.com.
 webmail         IN      CNAME   www.oonrumail.com.
 '''
 
+
+def fix_compose_healthcheck():
+    """Disable the CoreDNS health check in docker-compose.yml (it used nslookup)."""
+    path = '/opt/oonrumail/app/docker-compose.yml'
+    content = original = read_text(path)
+
+    # The CoreDNS image is scratch-based: no nslookup, no shell, nothing a
+    # healthcheck could run. Disable it and rely on the restart policy.
+    old_healthcheck = '''    healthcheck:
+      test: ["CMD", "nslookup", "example.com", "localhost"]
+      interval: 30s
+      timeout: 10s
+      retries: 3
+      start_period: 10s
+    networks:
+      - email-network
+
+  # Adminer'''
+
+    # Written directly; this used to take a second fix_coredns_hc.py pass
+    new_healthcheck = '''    healthcheck:
+      disable: true
+    networks:
+      - email-network
+
+  # Adminer'''
+
+    if old_healthcheck in content:
+        content = content.replace(old_healthcheck, new_healthcheck)
+        print("Fixed docker-compose.yml healthcheck")
+    else:
+        # Try a more flexible match
+        replacement = '''    healthcheck:
+      disable: true
+'''
+        content, count = _HEALTHCHECK_RE.subn(replacement, content, count=1)
+        if count:
+            print("Fixed docker-compose.yml healthcheck (regex)")
+        else:
+            print("WARNING: Could not find CoreDNS healthcheck to fix")
+
+    write_if_changed(path, content, original)
+
+
+def update_corefile():
+    """Update Corefile to add oonrumail.com zone."""
+    path = '/opt/oonrumail/app/docker/config/coredns/Corefile'
+
+    corefile = COREFILE_TMPL.format(ip=SERVER_IP)
+
+    atomic_write(path, corefile)
+    print(f"Updated Corefile at {path}")
+
+
+def create_oonrumail_zone():
+    """Create the oonrumail.com zone file."""
+    zones_dir = '/opt/oonrumail/app/docker/config/coredns/zones'
+    os.makedirs(zones_dir, exist_ok=True)
+
+    zone = ZONE_TMPL.format(ip=SERVER_IP)
+
     zone_path = os.path.join(zones_dir, 'oonrumail.com.zone')
-    with open(zone_path, 'w') as f:
-        f.write(zone)
+    atomic_write(zone_path, zone)
     print(f"Created zone file at {zone_path}")
 
 
 def update_example_zone():
     """Update example.com zone to use real server IP."""
     path = '/opt/oonrumail/app/docker/config/coredns/zones/example.com.zone'
-    with open(path, 'r') as f:
-        content = f.read()
+    content = original = read_text(path)
 
     # Replace Docker internal IP with real server IP
     content = content.replace('172.28.0.1', SERVER_IP)
 
-    with open(path, 'w') as f:
-        f.write(content)
-    print(f"Updated example.com zone to use {SERVER_IP}")
+    if write_if_changed(path, content, original):
+        print(f"Updated example.com zone to use {SERVER_IP}")
+    else:
+        print(f"example.com zone already uses {SERVER_IP}")
 
 
 if __name__ == '__main__':
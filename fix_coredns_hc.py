@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 """Remove the healthcheck from CoreDNS in docker-compose.yml since
-the scratch-based container has no shell or utilities."""
+the scratch-based container has no shell or utilities.
+
+Only needed for compose files already patched by an older fix_coredns.py
+(CMD-SHELL true); fix_coredns.py now writes `disable: true` directly."""
+from scripts._fileio import atomic_write, read_text
+
 path = '/opt/oonrumail/app/docker-compose.yml'
-with open(path, 'r') as f:
-    content = f.read()
+content = read_text(path)
 
 # Replace the CMD-SHELL true healthcheck with disable
-content = content.replace(
+old_healthcheck = (
     '    healthcheck:\n'
     '      test: ["CMD-SHELL", "true"]\n'
     '      interval: 30s\n'
@@ -16,8 +20,9 @@ content = content.replace(
     '    networks:\n'
     '      - email-network\n'
     '\n'
-    '  # Adminer',
-
+    '  # Adminer'
+)
+new_healthcheck = (
     '    healthcheck:\n'
     '      disable: true\n'
     '    networks:\n'
@@ -26,6 +31,10 @@ content = content.replace(
     '  # Adminer'
 )
 
-with open(path, 'w') as f:
-    f.write(content)
-print("Disabled CoreDNS healthcheck (scratch image has no binaries)")
+if old_healthcheck in content:
+    atomic_write(path, content.replace(old_healthcheck, new_healthcheck))
+    print("Disabled CoreDNS healthcheck (scratch image has no binaries)")
+elif new_healthcheck in content:
+    print("CoreDNS healthcheck already disabled, nothing to do")
+else:
+    print("WARNING: Could not find CoreDNS healthcheck to fix (run fix_coredns.py first)")
@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 """Fix transactional-api config.yaml to listen on port 8085 (matching compose)."""
+from scripts._fileio import read_text, write_if_changed
+
 path = '/opt/oonrumail/app/services/transactional-api/config.yaml'
-with open(path, 'r') as f:
-    content = f.read()
+content = original = read_text(path)
 
 # Change addr from :8080 to use PORT env var
 content = content.replace('addr: ":8080"', 'addr: ":${PORT}"')
 
-with open(path, 'w') as f:
-    f.write(content)
-print("Fixed!")
+if write_if_changed(path, content, original):
+    print("Fixed!")
+else:
+    print("No changes needed")
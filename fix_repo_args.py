@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """Remove logger args from repository constructors in main.go"""
+from scripts._fileio import read_text, write_if_changed
+
 path = '/opt/oonrumail/app/services/calendar/main.go'
-with open(path, 'r') as f:
-    content = f.read()
+content = original = read_text(path)
 
 content = content.replace(
     'repository.NewCalendarRepository(dbPool, logger.Named("calendar-repo"))',
@@ -17,6 +18,7 @@ content = content.replace(
     'repository.NewAttendeeRepository(dbPool)'
 )
 
-with open(path, 'w') as f:
-    f.write(content)
-print("Fixed!")
+if write_if_changed(path, content, original):
+    print("Fixed!")
+else:
+    print("No changes needed")
@@ -0,0 +1,60 @@
+"""Shared file helpers for the fix_*.py scripts.
+
+The scripts in this directory import it as _fileio; the ones at the repo
+root import it as scripts._fileio, so there is a single copy to maintain.
+"""
+import os
+import shutil
+from functools import lru_cache
+
+_WRITE_BUFFER = 1 << 20
+
+
+@lru_cache(maxsize=64)
+def read_text(path):
+    """Read a file once per process; later calls for the same path hit the cache."""
+    with open(path, 'r') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=64)
+def read_bytes(path):
+    """Bytes counterpart of read_text."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def atomic_write(path, data):
+    """Write str or bytes to path via a sibling temp file + os.replace.
+
+    A crash mid-write leaves the original file untouched instead of truncated.
+    The payload goes out as one large sequential write into preallocated space.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    tmp = path + '.tmp'
+    with open(tmp, 'wb', buffering=_WRITE_BUFFER) as f:
+        if data and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(f.fileno(), 0, len(data))
+            except OSError:
+                pass  # filesystem doesn't support preallocation
+        f.write(data)
+    if os.path.exists(path):
+        shutil.copymode(path, tmp)
+    os.replace(tmp, path)
+    # Cached reads of this (or any) path are now stale
+    read_text.cache_clear()
+    read_bytes.cache_clear()
+
+
+def write_if_changed(path, new, old):
+    """atomic_write new to path unless it equals the original content.
+
+    Returns True if the file was rewritten. Skipping no-op writes keeps mtimes
+    stable so Go build caches and Docker layers aren't invalidated on re-runs.
+    """
+    if new is old or new == old:
+        return False
+    atomic_write(path, new)
+    return True
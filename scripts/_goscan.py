@@ -0,0 +1,62 @@
+"""Minimal structural scanner for Go source used by the fix_*.py scripts.
+
+Not a full parser: it only understands enough of Go's lexical structure
+(string/rune/raw literals and comments) to match braces reliably, so a
+declaration's `{ ... }` body can be located in a single pass over the text
+instead of splitting into lines and counting braces by hand.
+"""
+import re
+
+# Tokens that may contain braces we must ignore, plus the braces themselves
+_TOKEN_RE = re.compile(
+    r'"(?:\\.|[^"\\\n])*"'   # interpreted string
+    r"|'(?:\\.|[^'\\\n])*'"  # rune
+    r'|`[^`]*`'              # raw string / struct tag
+    r'|//[^\n]*'             # line comment
+    r'|/\*.*?\*/'            # block comment
+    r'|[{}]',
+    re.S,
+)
+
+TOP_LEVEL_STRUCT_RE = re.compile(r'^type (\w+)[^\n]*\bstruct \{', re.M)
+TOP_LEVEL_FUNC_RE = re.compile(r'^func ', re.M)
+
+
+def block_end(src, open_pos):
+    """Return the offset just past the `}` matching the `{` at open_pos."""
+    depth = 0
+    for m in _TOKEN_RE.finditer(src, open_pos):
+        tok = m.group(0)
+        if tok == '{':
+            depth += 1
+        elif tok == '}':
+            depth -= 1
+            if depth == 0:
+                return m.end()
+    raise ValueError(f"unbalanced braces starting at offset {open_pos}")
+
+
+def find_block(src, header, start=0):
+    """Locate the first declaration matching header (a str or compiled regex).
+
+    Returns (decl_start, body_end) where decl_start is the start of the
+    header's line and body_end is just past its closing brace, or None.
+    """
+    if isinstance(header, str):
+        pos = src.find(header, start)
+        if pos < 0:
+            return None
+        brace = src.index('{', pos)
+    else:
+        m = header.search(src, start)
+        if not m:
+            return None
+        pos = m.start()
+        brace = src.index('{', pos)
+    return src.rfind('\n', 0, pos) + 1, block_end(src, brace)
+
+
+def line_end(src, pos):
+    """Offset just past the newline that ends the line containing pos."""
+    nl = src.find('\n', pos)
+    return len(src) if nl < 0 else nl + 1
@@ -0,0 +1,19 @@
+"""Single-pass literal find/replace shared by the fix_*.py scripts."""
+import re
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _alternation(keys):
+    # Longest first so a key that is a prefix of another never shadows it
+    return re.compile('|'.join(re.escape(k) for k in sorted(keys, key=len, reverse=True)))
+
+
+def replace_many(content, mapping):
+    """Replace every old -> new pair of mapping in one scan of content.
+
+    Equivalent to chained str.replace calls as long as no replacement text
+    itself contains another key. Returns (new_content, number_of_replacements)
+    like re.subn.
+    """
+    return _alternation(tuple(mapping)).subn(lambda m: mapping[m.group(0)], content)
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 """Final comprehensive OONRUMAIL smoke test"""
-import urllib.request, json, socket, uuid
+import selectors, socket, time, uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from smoke_common import dumps, http_request, loads
 
 BASE = "http://localhost"
 results = []
+pool = ThreadPoolExecutor(max_workers=16)
 
 def log(test, status, detail=""):
     icon = "✅" if status == "PASS" else "❌" if status == "FAIL" else "⚠️"
@@ -12,12 +16,9 @@ def log(test, status, detail=""):
 
 def http_get(url, token=None, timeout=10):
     h = {"Authorization": f"Bearer {token}"} if token else {}
-    req = urllib.request.Request(url, headers=h)
     try:
-        resp = urllib.request.urlopen(req, timeout=timeout)
-        return resp.status, resp.read().decode()[:500]
-    except urllib.error.HTTPError as e:
-        return e.code, e.read().decode()[:500]
+        status, body = http_request("GET", url, headers=h, timeout=timeout)
+        return status, body.decode()[:500]
     except Exception as e:
         return 0, str(e)
 
@@ -25,23 +26,63 @@ def http_post(url, data, token=None, timeout=10):
     h = {"Content-Type": "application/json"}
     if token:
         h["Authorization"] = f"Bearer {token}"
-    req = urllib.request.Request(url, data=json.dumps(data).encode(), headers=h, method="POST")
     try:
-        resp = urllib.request.urlopen(req, timeout=timeout)
-        return resp.status, json.loads(resp.read())
-    except urllib.error.HTTPError as e:
-        return e.code, json.loads(e.read()) if e.read() else {}
+        status, body = http_request("POST", url, dumps(data), h, timeout)
+        return status, loads(body) if body else {}
     except Exception as e:
         return 0, {"error": str(e)}
 
-def check_tcp(host, port, timeout=5):
-    try:
-        s = socket.create_connection((host, port), timeout=timeout)
-        banner = s.recv(1024).decode(errors='replace').strip()
-        s.close()
-        return True, banner
-    except Exception as e:
-        return False, str(e)
+def check_tcp(targets, timeout=5):
+    """Grab the greeting banner from each (host, port) concurrently.
+
+    All sockets connect non-blocking and share one selector, so the worst case
+    is a single timeout instead of one per port. Like create_connection, every
+    address a host resolves to is tried; here they race and the first one to
+    send a banner wins. Returns [(ok, banner)] in order.
+    """
+    out = [(False, "timed out")] * len(targets)
+    pending = [0] * len(targets)  # sockets still in flight per target
+    sel = selectors.DefaultSelector()
+    for i, (host, port) in enumerate(targets):
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except Exception as e:
+            out[i] = (False, str(e))
+            continue
+        for family, type_, proto, _, addr in infos:
+            try:
+                s = socket.socket(family, type_, proto)
+            except OSError as e:
+                out[i] = (False, str(e))
+                continue
+            s.setblocking(False)
+            s.connect_ex(addr)
+            sel.register(s, selectors.EVENT_READ, i)
+            pending[i] += 1
+    deadline = time.monotonic() + timeout
+    while sel.get_map() and (remaining := deadline - time.monotonic()) > 0:
+        for key, _ in sel.select(remaining):
+            s, i = key.fileobj, key.data
+            if s.fileno() < 0:
+                continue  # closed below when another address already won
+            sel.unregister(s)
+            pending[i] -= 1
+            try:
+                out[i] = (True, s.recv(1024).decode(errors='replace').strip())
+            except Exception as e:
+                # Report the error unless another address is still trying
+                if not pending[i]:
+                    out[i] = (False, str(e))
+            else:
+                for other in [k.fileobj for k in sel.get_map().values() if k.data == i]:
+                    sel.unregister(other)
+                    other.close()
+                    pending[i] -= 1
+            s.close()
+    for key in list(sel.get_map().values()):
+        key.fileobj.close()
+    sel.close()
+    return out
 
 print("=" * 70)
 print("  OONRUMAIL PLATFORM - FINAL SMOKE TEST")
@@ -56,16 +97,18 @@ health_checks = [
     ("Storage", 8085), ("Chat", 8086), ("SMS Gateway", 8087),
     ("AI Assistant", 8090), ("Calendar", 8092), ("Transactional API", 8095),
 ]
-for name, port in health_checks:
-    s, b = http_get(f"{BASE}:{port}/health")
+# Fire all checks at once; results come back in submission order
+responses = pool.map(lambda t: http_get(f"{BASE}:{t[1]}/health"), health_checks)
+for (name, port), (s, b) in zip(health_checks, responses):
     log(f"{name}", "PASS" if s == 200 else "FAIL", f"HTTP {s}")
 
 # 2. PROTOCOL BANNERS
 print("\n📋 PHASE 2: Protocol Banners")
 print("-" * 50)
 
-for name, port, expect in [("SMTP:587", 587, "220"), ("SMTP:25", 25, "220"), ("IMAP:143", 143, "OK")]:
-    ok, banner = check_tcp("localhost", port)
+banner_checks = [("SMTP:587", 587, "220"), ("SMTP:25", 25, "220"), ("IMAP:143", 143, "OK")]
+banners = check_tcp([("localhost", port) for _, port, _ in banner_checks])
+for (name, port, expect), (ok, banner) in zip(banner_checks, banners):
     log(name, "PASS" if ok and expect in banner else "FAIL", banner[:70])
 
 # 3. AUTHENTICATION
@@ -100,8 +143,8 @@ tests = [
     ("Storage Quota", f"{BASE}:8085/api/v1/quotas?organization_id={org_id}"),
     ("Domain Manager", f"{BASE}:8084/api/admin/domains?organization_id={org_id}"),
 ]
-for name, url in tests:
-    s, b = http_get(url, token)
+responses = pool.map(lambda t: http_get(t[1], token), tests)
+for (name, url), (s, b) in zip(tests, responses):
     log(name, "PASS" if s in [200, 401, 403] else "FAIL", f"HTTP {s}")
 
 # 5. TRANSACTIONAL EMAIL
@@ -117,12 +160,14 @@ print("-" * 50)
 
 s, b = http_get(f"{BASE}:8025/api/v1/messages")
 if s == 200:
-    data = json.loads(b)
+    data = loads(b)
     count = data.get("messages_count", data.get("total", 0))
     log("Mailpit", "PASS", f"HTTP {s}, {count} messages")
 else:
     log("Mailpit", "FAIL", f"HTTP {s}")
 
+pool.shutdown()
+
 # SUMMARY
 print("\n" + "=" * 70)
 print("  SUMMARY")
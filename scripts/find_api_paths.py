@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 """Get token structure and test authenticated API calls"""
 import urllib.request, json, sys
+from concurrent.futures import ThreadPoolExecutor
+
+from smoke_common import dumps, loads
 
 def post(url, data):
-    req = urllib.request.Request(url, data=json.dumps(data).encode(),
+    req = urllib.request.Request(url, data=dumps(data),
         headers={"Content-Type": "application/json"}, method="POST")
     try:
         resp = urllib.request.urlopen(req, timeout=10)
-        return resp.status, json.loads(resp.read())
+        return resp.status, loads(resp.read())
     except urllib.error.HTTPError as e:
-        return e.code, json.loads(e.read())
+        return e.code, loads(e.read())
 
 def get(url, token=None):
     h = {}
@@ -67,10 +70,17 @@ services = {
     "DomainMgr:8084":["/api/domains", "/api/v1/domains", "/domains"],
 }
 
+# Probe the whole service x path grid in parallel, then print in declared order
+with ThreadPoolExecutor(max_workers=16) as ex:
+    probes = {
+        (svc, path): ex.submit(get, f"http://localhost:{svc.split(':')[1]}{path}", token)
+        for svc, paths in services.items() for path in paths
+    }
+
 for svc, paths in services.items():
     name, port = svc.split(":")
     print(f"\n{name} (:{port}):")
     for path in paths:
-        s, b = get(f"http://localhost:{port}{path}", token)
+        s, b = probes[(svc, path)].result()
         marker = "✅" if s in [200, 401, 403] else "  "
         print(f"  {marker} {path} -> {s} {b[:100]}")
@@ -1,20 +1,36 @@
 import os
 import glob
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+
+from _fileio import atomic_write
 
 base = '/opt/oonrumail/app/services/ai-assistant'
-files = glob.glob(os.path.join(base, '**', '*.go'), recursive=True)
-
-count = 0
-for fpath in files:
-    with open(fpath, 'r') as f:
-        content = f.read()
-
-    # Fix the mangled replacement: ', " )' -> ', "")'
-    if ', " )' in content:
-        content = content.replace(', " )', ', "")')
-        with open(fpath, 'w') as f:
-            f.write(content)
-        count += 1
-        print(f"Fixed {fpath}")
+# Lazy walk: workers start on the first files while the tree is still being enumerated
+files = glob.iglob(os.path.join(base, '**', '*.go'), recursive=True)
+
+# The mangled replacement: ', " )' -> ', "")'
+BROKEN = b', " )'
+FIXED = b', "")'
+
+
+def fix_file(fpath):
+    with open(fpath, 'rb') as f:
+        # Cheap presence test on the mapped file; most files never need a rewrite
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(BROKEN) < 0:
+                return False
+            content = mm[:]
+
+    # Temp file + os.replace, so a failed write never leaves a truncated .go file
+    atomic_write(fpath, content.replace(BROKEN, FIXED))
+    print(f"Fixed {fpath}")
+    return True
+
+
+with ThreadPoolExecutor() as ex:
+    count = sum(ex.map(fix_file, files))
 
 print(f"\nFixed {count} files")
@@ -0,0 +1,282 @@
+"""Apply every calendar service build fix in one run.
+
+Replaces the old fix_calendar.py -> fix_dup.py -> fix_calendar2.py -> fix_calendar3.py
+-> fix_cal_trans.py -> fix_calendar4.py -> fix_calendar5.py -> fix_config.py chain.
+Each Go file is read once, all edits are applied in memory in dependency order
+(models before service so struct fields exist first), then each file is written once.
+"""
+from _fileio import write_if_changed
+from _goscan import find_block
+from _rewrite import replace_many
+
+bt = chr(96)  # backtick
+
+FILES = {
+    'models': '/opt/oonrumail/app/services/calendar/models/models.go',
+    'svc': '/opt/oonrumail/app/services/calendar/service/calendar.go',
+    'notif': '/opt/oonrumail/app/services/calendar/service/notification.go',
+    'cfg': '/opt/oonrumail/app/services/calendar/config/config.go',
+}
+
+# UpdateEventRequest fields became pointers
+POINTER_FIXES = {
+    # Title: *string
+    'if req.Title != "" && req.Title != event.Title {\n\t\tevent.Title = req.Title':
+        'if req.Title != nil && *req.Title != event.Title {\n\t\tevent.Title = *req.Title',
+    # StartTime: *time.Time
+    'if !req.StartTime.IsZero() && !req.StartTime.Equal(event.StartTime) {\n\t\tevent.StartTime = req.StartTime':
+        'if req.StartTime != nil && !req.StartTime.IsZero() && !req.StartTime.Equal(event.StartTime) {\n\t\tevent.StartTime = *req.StartTime',
+    # EndTime: *time.Time
+    'if !req.EndTime.IsZero() && !req.EndTime.Equal(event.EndTime) {\n\t\tevent.EndTime = req.EndTime':
+        'if req.EndTime != nil && !req.EndTime.IsZero() && !req.EndTime.Equal(event.EndTime) {\n\t\tevent.EndTime = *req.EndTime',
+    # Timezone: *string
+    'if req.Timezone != "" {\n\t\tevent.Timezone = req.Timezone':
+        'if req.Timezone != nil && *req.Timezone != "" {\n\t\tevent.Timezone = *req.Timezone',
+    # Status: *EventStatus
+    'if req.Status != "" {\n\t\tevent.Status = req.Status':
+        'if req.Status != nil && *req.Status != "" {\n\t\tevent.Status = *req.Status',
+    # Visibility: *string
+    'if req.Visibility != "" {\n\t\tevent.Visibility = req.Visibility':
+        'if req.Visibility != nil && *req.Visibility != "" {\n\t\tevent.Visibility = *req.Visibility',
+}
+
+
+def apply_models(buf):
+    content = buf['models']
+
+    # Add Attendees and Reminders to Event struct (non-DB fields),
+    # right before the closing } of the struct body. Checking only the struct
+    # body keeps re-runs from inserting a duplicate Reminders field.
+    event = find_block(content, 'type Event struct {')
+    if event is not None and 'Attendees' not in content[event[0]:event[1]]:
+        close = content.rfind('\n', 0, event[1] - 1) + 1
+        new_fields = (
+            f'\tAttendees       []*Attendee {bt}json:"attendees,omitempty" db:"-"{bt}\n'
+            f'\tReminders       []Reminder  {bt}json:"reminders,omitempty" db:"-"{bt}\n'
+        )
+        content = content[:close] + new_fields + content[close:]
+        print("Added Attendees and Reminders fields to Event struct")
+
+    # EventListResponse has: Events, TotalCount, HasMore
+    # Service uses: Total, Limit, Offset -> add the missing fields
+    old_resp = f'''type EventListResponse struct {{
+\tEvents     []*Event {bt}json:"events"{bt}
+\tTotalCount int      {bt}json:"total_count"{bt}
+\tHasMore    bool     {bt}json:"has_more"{bt}
+}}'''
+    new_resp = f'''type EventListResponse struct {{
+\tEvents     []*Event {bt}json:"events"{bt}
+\tTotalCount int      {bt}json:"total_count"{bt}
+\tTotal      int      {bt}json:"total"{bt}
+\tLimit      int      {bt}json:"limit"{bt}
+\tOffset     int      {bt}json:"offset"{bt}
+\tHasMore    bool     {bt}json:"has_more"{bt}
+}}'''
+    if old_resp in content:
+        content = content.replace(old_resp, new_resp)
+        print("Added Total, Limit, Offset fields to EventListResponse")
+
+    buf['models'] = content
+
+
+def apply_svc(buf):
+    content = buf['svc']
+
+    # BulkCreate: req.Reminders is []models.CreateReminderRequest, repo wants []*models.Reminder
+    # (Reminder's actual fields are Method and Minutes)
+    content = content.replace(
+        'if err := s.reminderRepo.BulkCreate(ctx, event.ID, req.Reminders); err != nil {',
+        '''reminders := make([]*models.Reminder, len(req.Reminders))
+\t\tfor i, r := range req.Reminders {
+\t\t\treminders[i] = &models.Reminder{
+\t\t\t\tID:       uuid.New(),
+\t\t\t\tEventID:  event.ID,
+\t\t\t\tMethod:   r.Method,
+\t\t\t\tMinutes:  r.Minutes,
+\t\t\t}
+\t\t}
+\t\tif err := s.reminderRepo.BulkCreate(ctx, event.ID, reminders); err != nil {'''
+    )
+
+    # BulkCreate: req.Attendees is []models.CreateAttendeeRequest, repo wants []*models.Attendee
+    content = content.replace(
+        'if err := s.attendeeRepo.BulkCreate(ctx, event.ID, req.Attendees); err != nil {',
+        '''attendees := make([]*models.Attendee, len(req.Attendees))
+\t\t\tfor i, a := range req.Attendees {
+\t\t\t\tattendees[i] = &models.Attendee{
+\t\t\t\t\tID:      uuid.New(),
+\t\t\t\t\tEventID: event.ID,
+\t\t\t\t\tEmail:   a.Email,
+\t\t\t\t\tName:    a.Name,
+\t\t\t\t\tRole:    a.Role,
+\t\t\t\t\tStatus:  "needs-action",
+\t\t\t\t}
+\t\t\t}
+\t\t\tif err := s.attendeeRepo.BulkCreate(ctx, event.ID, attendees); err != nil {'''
+    )
+
+    # GetByEventID returns []*models.Reminder but Event.Reminders is []models.Reminder
+    content = content.replace(
+        'event.Reminders, _ = s.reminderRepo.GetByEventID(ctx, event.ID)',
+        'if rems, err := s.reminderRepo.GetByEventID(ctx, event.ID); err == nil {\n\t\tfor _, r := range rems {\n\t\t\tevent.Reminders = append(event.Reminders, *r)\n\t\t}\n\t}'
+    )
+    content = content.replace(
+        'event.Reminders, _ = s.reminderRepo.GetByEventID(ctx, eventID)',
+        'if rems, err := s.reminderRepo.GetByEventID(ctx, eventID); err == nil {\n\t\tfor _, r := range rems {\n\t\t\tevent.Reminders = append(event.Reminders, *r)\n\t\t}\n\t}'
+    )
+    content = content.replace(
+        'e.Reminders, _ = s.reminderRepo.GetByEventID(ctx, e.ID)',
+        'if rems, err := s.reminderRepo.GetByEventID(ctx, e.ID); err == nil {\n\t\t\tfor _, r := range rems {\n\t\t\t\te.Reminders = append(e.Reminders, *r)\n\t\t\t}\n\t\t}'
+    )
+
+    # Pointer type comparisons in UpdateEvent
+    content, n = replace_many(content, POINTER_FIXES)
+    if n:
+        print(f"Fixed {n} pointer comparisons in UpdateEvent")
+
+    # UpdateEventRequest has no Transparency field - drop its handling entirely
+    content = content.replace(
+        '\tif req.Transparency != "" {\n\t\tevent.Transparency = req.Transparency\n\t}\n',
+        ''
+    )
+
+    # ReplaceForEvent receives []CreateReminderRequest but expects []*Reminder
+    old_replace = 'if err := s.reminderRepo.ReplaceForEvent(ctx, eventID, req.Reminders); err != nil {'
+    if old_replace in content:
+        content = content.replace(old_replace, '''newReminders := make([]*models.Reminder, len(req.Reminders))
+\t\t\tfor i, r := range req.Reminders {
+\t\t\t\tnewReminders[i] = &models.Reminder{
+\t\t\t\t\tID:      uuid.New(),
+\t\t\t\t\tEventID: eventID,
+\t\t\t\t\tMethod:  r.Method,
+\t\t\t\t\tMinutes: r.Minutes,
+\t\t\t\t}
+\t\t\t}
+\t\t\tif err := s.reminderRepo.ReplaceForEvent(ctx, eventID, newReminders); err != nil {''')
+        print("Fixed ReplaceForEvent reminder conversion")
+
+    # FreeBusyResponse.Periods -> FreeBusy
+    content = content.replace('Periods:', 'FreeBusy:')
+    content = content.replace('fbr.Periods', 'fbr.FreeBusy')
+
+    # Convert []*FreeBusyPeriod to []FreeBusy when building the response
+    content = content.replace(
+        '''fbr := &models.FreeBusyResponse{
+\t\t\tUserID:  uid,
+\t\t\tFreeBusy: userPeriods[uid],
+\t\t}
+\t\tif fbr.FreeBusy == nil {
+\t\t\tfbr.FreeBusy = []*models.FreeBusyPeriod{}
+\t\t}''',
+        '''var freeBusySlots []models.FreeBusy
+\t\tfor _, p := range userPeriods[uid] {
+\t\t\tfreeBusySlots = append(freeBusySlots, models.FreeBusy{
+\t\t\t\tStart:  p.Start,
+\t\t\t\tEnd:    p.End,
+\t\t\t\tStatus: p.Status,
+\t\t\t})
+\t\t}
+\t\tfbr := &models.FreeBusyResponse{
+\t\t\tUserID:   uid,
+\t\t\tFreeBusy: freeBusySlots,
+\t\t}'''
+    )
+
+    # Imports: uuid is now needed, strings no longer is
+    if '"github.com/google/uuid"' not in content:
+        content = content.replace('"fmt"', '"fmt"\n\n\t"github.com/google/uuid"')
+        print("Added uuid import to service/calendar.go")
+    content = content.replace('\t"strings"\n', '')
+
+    buf['svc'] = content
+    print("Fixed service/calendar.go")
+
+
+def apply_notif(buf):
+    content = buf['notif']
+
+    # EventStatus is a named type - cast it
+    content = content.replace(
+        'statusToICalStatus(event.Status)',
+        'statusToICalStatus(string(event.Status))'
+    )
+
+    # s.config.Server.PublicURL -> s.publicURL (set in the constructor)
+    content = content.replace('s.config.Server.PublicURL', 's.publicURL')
+
+    # SMTP settings live in NotificationConfig
+    content = content.replace('s.config.Notifications', 's.config.Notification')
+    content = content.replace('s.config.SMTP.Host', 's.config.Notification.SMTPHost')
+    content = content.replace('s.config.SMTP.Port', 's.config.Notification.SMTPPort')
+    content = content.replace('s.config.SMTP.From', 's.config.Notification.FromEmail')
+    content = content.replace('s.config.SMTP', 's.config.Notification')  # Catch any remaining
+
+    # Add publicURL field to NotificationService
+    svc = find_block(content, 'type NotificationService struct {')
+    if svc is not None and 'publicURL' not in content[svc[0]:svc[1]]:
+        content = content.replace(
+            'type NotificationService struct {',
+            'type NotificationService struct {\n\tpublicURL string'
+        )
+        print("Added publicURL field to NotificationService")
+
+    # Initialize publicURL in the constructor from env or default
+    if 'func NewNotificationService' in content:
+        if 'publicURL' not in content.split('func NewNotificationService')[1].split('return')[0]:
+            content = content.replace(
+                'return &NotificationService{',
+                'publicURL := os.Getenv("PUBLIC_URL")\n\tif publicURL == "" {\n\t\tpublicURL = "https://calendar.localhost"\n\t}\n\treturn &NotificationService{\n\t\tpublicURL: publicURL,'
+            )
+            if '"os"' not in content:
+                content = content.replace('"bytes"', '"bytes"\n\t"os"')
+            print("Added publicURL initialization")
+
+    buf['notif'] = content
+    print("Fixed service/notification.go")
+
+
+def apply_cfg(buf):
+    content = buf['cfg']
+
+    # Remove lines whose struct-tag backticks got mangled into \" escapes
+    lines = content.split('\n')
+    cleaned = [l for l in lines if 'yaml:\\' not in l]
+    content = '\n'.join(cleaned)
+
+    # Add PublicURL to ServerConfig
+    if 'PublicURL' not in content:
+        content = content.replace(
+            f'AllowedOrigins []string {bt}yaml:"allowedOrigins"{bt}',
+            f'AllowedOrigins []string {bt}yaml:"allowedOrigins"{bt}\n\tPublicURL      string   {bt}yaml:"publicURL"{bt}'
+        )
+        print("Added PublicURL to ServerConfig")
+
+    # Add Username and Password to NotificationConfig
+    content = content.replace(
+        f'\tReminderLookAhead int {bt}yaml:"reminderLookAhead"{bt} // Minutes to look ahead for reminders',
+        f'\tReminderLookAhead int    {bt}yaml:"reminderLookAhead"{bt} // Minutes to look ahead for reminders\n'
+        f'\tUsername          string {bt}yaml:"username"{bt}\n'
+        f'\tPassword          string {bt}yaml:"password"{bt}'
+    )
+
+    buf['cfg'] = content
+    print("Fixed config/config.go")
+
+
+if __name__ == '__main__':
+    buf = {}
+    for k, p in FILES.items():
+        with open(p, 'r') as f:
+            buf[k] = f.read()
+    original = dict(buf)
+
+    apply_models(buf)
+    apply_svc(buf)
+    apply_notif(buf)
+    apply_cfg(buf)
+
+    for k, p in FILES.items():
+        if not write_if_changed(p, buf[k], original[k]):
+            print(f"No changes needed for {p}")
+
+    print("\nAll calendar fixes applied!")
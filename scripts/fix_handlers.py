@@ -1,11 +1,32 @@
 import os
 
+from _fileio import write_if_changed
+from _rewrite import replace_many
+
 bt = chr(96)
 
+# handlers/other.go type fixes, applied in a single pass
+HANDLER_FIXES = {
+    # Scope validation - cast APIKeyScope to string for map lookup
+    'if !validScopes[scope] {': 'if !validScopes[string(scope)] {',
+    '"Invalid scope: " + scope': '"Invalid scope: " + string(scope)',
+    # RateLimit - change from pointer to value comparison
+    'if req.RateLimit != nil {\n\t\trateLimit = *req.RateLimit\n\t}':
+        'if req.RateLimit > 0 {\n\t\trateLimit = req.RateLimit\n\t}',
+    # repo.Create expects []string but req.Scopes is []APIKeyScope - convert first
+    'key, rawKey, err := h.repo.Create(r.Context(), orgID, req.Name, req.Scopes, rateLimit, req.ExpiresAt)':
+        '''scopeStrings := make([]string, len(req.Scopes))
+\tfor i, s := range req.Scopes {
+\t\tscopeStrings[i] = string(s)
+\t}
+
+\tkey, rawKey, err := h.repo.Create(r.Context(), orgID, req.Name, scopeStrings, rateLimit, req.ExpiresAt)''',
+}
+
 # Fix 1: Add AddSuppressionRequest to suppression.go
 supp_path = '/opt/oonrumail/app/services/transactional-api/models/suppression.go'
 with open(supp_path, 'r') as f:
-    content = f.read()
+    content = original = f.read()
 
 if 'AddSuppressionRequest' not in content:
     content += f"""
@@ -16,8 +37,8 @@ type AddSuppressionRequest struct {{
 \tReason string {bt}json:"reason,omitempty"{bt}
 }}
 """
-    with open(supp_path, 'w') as f:
-        f.write(content)
+
+if write_if_changed(supp_path, content, original):
     print("Added AddSuppressionRequest to suppression.go")
 else:
     print("AddSuppressionRequest already exists")
@@ -25,7 +46,7 @@ else:
 # Fix 2: Add APIKeyResponse to api_key.go
 apikey_path = '/opt/oonrumail/app/services/transactional-api/models/api_key.go'
 with open(apikey_path, 'r') as f:
-    content = f.read()
+    content = original = f.read()
 
 if 'type APIKeyResponse struct' not in content:
     content += f"""
@@ -42,8 +63,8 @@ type APIKeyResponse struct {{
 \tCreatedAt time.Time    {bt}json:"created_at"{bt}
 }}
 """
-    with open(apikey_path, 'w') as f:
-        f.write(content)
+
+if write_if_changed(apikey_path, content, original):
     print("Added APIKeyResponse to api_key.go")
 else:
     print("APIKeyResponse already exists")
@@ -51,39 +72,12 @@ else:
 # Fix 3: Fix handlers/other.go type issues
 handler_path = '/opt/oonrumail/app/services/transactional-api/handlers/other.go'
 with open(handler_path, 'r') as f:
-    content = f.read()
-
-# Fix scope validation - cast APIKeyScope to string for map lookup
-content = content.replace(
-    'if !validScopes[scope] {',
-    'if !validScopes[string(scope)] {'
-)
-content = content.replace(
-    '"Invalid scope: " + scope',
-    '"Invalid scope: " + string(scope)'
-)
-
-# Fix RateLimit - change from pointer to value comparison
-content = content.replace(
-    'if req.RateLimit != nil {\n\t\trateLimit = *req.RateLimit\n\t}',
-    'if req.RateLimit > 0 {\n\t\trateLimit = req.RateLimit\n\t}'
-)
-
-# Fix req.Scopes []APIKeyScope -> []string conversion for repo.Create
-# The repo.Create expects []string but req.Scopes is []APIKeyScope
-# We need to convert, or change the repo call
-# Easiest: convert scopes to []string before passing
-old_create = 'key, rawKey, err := h.repo.Create(r.Context(), orgID, req.Name, req.Scopes, rateLimit, req.ExpiresAt)'
-new_create = '''scopeStrings := make([]string, len(req.Scopes))
-\tfor i, s := range req.Scopes {
-\t\tscopeStrings[i] = string(s)
-\t}
+    content = original = f.read()
 
-\tkey, rawKey, err := h.repo.Create(r.Context(), orgID, req.Name, scopeStrings, rateLimit, req.ExpiresAt)'''
-content = content.replace(old_create, new_create)
+content, n = replace_many(content, HANDLER_FIXES)
+print(f"Applied {n} replacements to handlers/other.go")
 
-with open(handler_path, 'w') as f:
-    f.write(content)
-print("Fixed handlers/other.go type issues")
+if write_if_changed(handler_path, content, original):
+    print("Fixed handlers/other.go type issues")
 
 print("\nAll fixes applied!")
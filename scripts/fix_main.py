@@ -1,7 +1,9 @@
+from _fileio import write_if_changed
+
 filepath = '/opt/oonrumail/app/services/ai-assistant/main.go'
 
 with open(filepath, 'r') as f:
-    content = f.read()
+    content = original = f.read()
 
 # Check what imports are already there
 import_additions = []
@@ -60,7 +62,7 @@ new_services = """\t// Initialize smart reply service
 
 content = content.replace(handler_line, new_services)
 
-with open(filepath, 'w') as f:
-    f.write(content)
-
-print("Updated main.go with all service initializations")
+if write_if_changed(filepath, content, original):
+    print("Updated main.go with all service initializations")
+else:
+    print("main.go already has all service initializations")
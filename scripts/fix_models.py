@@ -1,10 +1,19 @@
 import os
 
+from _fileio import write_if_changed
+from _rewrite import replace_many
+
+# handlers/other.go WebhookEventType casts, applied in a single pass
+EVENT_TYPE_FIXES = {
+    'if !validEvents[event] {': 'if !validEvents[string(event)] {',
+    '"Invalid event type: " + event': '"Invalid event type: " + string(event)',
+}
+
 # Fix 1: Add WebhookResponse and PaginatedResponse to models
 webhook_path = '/opt/oonrumail/app/services/transactional-api/models/webhook.go'
 
 with open(webhook_path, 'r') as f:
-    content = f.read()
+    content = original = f.read()
 
 # Add WebhookResponse after the closing of Webhook struct if not already present
 if 'WebhookResponse' not in content:
@@ -24,8 +33,8 @@ type WebhookResponse struct {
 }
 '''
     content += addition
-    with open(webhook_path, 'w') as f:
-        f.write(content)
+
+if write_if_changed(webhook_path, content, original):
     print("Added WebhookResponse to webhook.go")
 else:
     print("WebhookResponse already exists")
@@ -33,13 +42,15 @@ else:
 # Fix 2: Add PaginatedResponse as a generic type
 # Check if it exists in any model file
 models_dir = '/opt/oonrumail/app/services/transactional-api/models'
+# Stream each file line by line and stop at the first hit
 found = False
-for fname in os.listdir(models_dir):
-    if fname.endswith('.go'):
-        fpath = os.path.join(models_dir, fname)
-        with open(fpath, 'r') as f:
-            if 'PaginatedResponse' in f.read():
-                print(f"PaginatedResponse already exists in {fname}")
+with os.scandir(models_dir) as it:
+    for de in it:
+        if not de.name.endswith('.go') or not de.is_file():
+            continue
+        with open(de.path, 'r') as f:
+            if any('PaginatedResponse' in ln for ln in f):
+                print(f"PaginatedResponse already exists in {de.name}")
                 found = True
                 break
 
@@ -57,28 +68,22 @@ type PaginatedResponse[T any] struct {
 }
 '''
     paginated_path = os.path.join(models_dir, 'pagination.go')
-    with open(paginated_path, 'w') as f:
-        f.write(paginated_content)
-    print("Created pagination.go with PaginatedResponse")
+    # No model file has the type yet, so there is no prior content to compare
+    if write_if_changed(paginated_path, paginated_content, None):
+        print("Created pagination.go with PaginatedResponse")
 
 # Fix 3: Fix the WebhookEventType as string map key in handlers/other.go
 handler_path = '/opt/oonrumail/app/services/transactional-api/handlers/other.go'
 with open(handler_path, 'r') as f:
-    content = f.read()
+    content = original = f.read()
 
 # The issue: validEvents is map[string]bool, but event is WebhookEventType
 # Fix: cast event to string in both the map lookup and the string concat
-content = content.replace(
-    'if !validEvents[event] {',
-    'if !validEvents[string(event)] {'
-)
-content = content.replace(
-    '"Invalid event type: " + event',
-    '"Invalid event type: " + string(event)'
-)
+content, _ = replace_many(content, EVENT_TYPE_FIXES)
 
-with open(handler_path, 'w') as f:
-    f.write(content)
-print("Fixed WebhookEventType as string in handlers/other.go")
+if write_if_changed(handler_path, content, original):
+    print("Fixed WebhookEventType as string in handlers/other.go")
+else:
+    print("handlers/other.go already casts WebhookEventType")
 
 print("\nAll fixes applied!")
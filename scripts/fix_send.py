@@ -1,15 +1,16 @@
+from _fileio import read_text, write_if_changed
+
 filepath = '/opt/oonrumail/app/services/transactional-api/handlers/send.go'
 
-with open(filepath, 'r') as f:
-    content = f.read()
+content = original = read_text(filepath)
 
 # Remove the stray import line and the dummy struct/var lines around it
-lines_to_remove = [
+lines_to_remove = frozenset((
     'import "transactional-api/repository"',
     '// Import for repository',
     'type repository struct{}',
     'var _ = repository{}',
-]
+))
 
 lines = content.split('\n')
 cleaned = [l for l in lines if l.strip() not in lines_to_remove]
@@ -21,7 +22,7 @@ content = content.replace(
     '\t"transactional-api/repository"\n\t"transactional-api/service"'
 )
 
-with open(filepath, 'w') as f:
-    f.write(content)
-
-print("Fixed send.go imports")
+if write_if_changed(filepath, content, original):
+    print("Fixed send.go imports")
+else:
+    print("send.go imports already fixed")
@@ -1,13 +1,14 @@
+from _fileio import read_text, write_if_changed
+
 filepath = '/opt/oonrumail/app/services/ai-assistant/handlers/threat.go'
 
-with open(filepath, 'r') as f:
-    content = f.read()
+content = original = read_text(filepath)
 
 # Remove the stray import and any surrounding comment
-lines_to_remove = [
+lines_to_remove = frozenset((
     '// Context key for imports',
     'import "context"',
-]
+))
 
 lines = content.split('\n')
 cleaned = [l for l in lines if l.strip() not in lines_to_remove]
@@ -19,7 +20,7 @@ content = content.replace(
     '"context"\n\t"encoding/json"'
 )
 
-with open(filepath, 'w') as f:
-    f.write(content)
-
-print("Fixed threat.go imports")
+if write_if_changed(filepath, content, original):
+    print("Fixed threat.go imports")
+else:
+    print("threat.go imports already fixed")
@@ -1,60 +1,66 @@
-import sys
+from _fileio import read_text, write_if_changed
+from _goscan import block_end, line_end
 
 filepath = '/opt/oonrumail/app/services/transactional-api/service/webhook.go'
 
-with open(filepath, 'r') as f:
-    lines = f.readlines()
+text = original = read_text(filepath)
+
+
+def line_offset(src, n):
+    """Offset of the start of 0-indexed line n (or len(src) past the end)."""
+    pos = 0
+    for _ in range(n):
+        nl = src.find('\n', pos)
+        if nl < 0:
+            return len(src)
+        pos = nl + 1
+    return pos
+
 
 # Fix 1: Lines 141-158 (0-indexed: 140-157)
 # The old payload construction + bounce if-block
-new_block_1 = [
-    '\tpayload := &models.WebhookPayload{\n',
-    '\t\tEvent:      models.WebhookEventType(event.EventType),\n',
-    '\t\tTimestamp:   event.Timestamp,\n',
-    '\t\tMessageID:   event.MessageID.String(),\n',
-    '\t\tRecipient:   event.Recipient,\n',
-    '\t\tUserAgent:   event.UserAgent,\n',
-    '\t\tIPAddress:   event.IPAddress,\n',
-    '\t\tURL:         event.URL,\n',
-    '\t\tBounceType:  event.BounceType,\n',
-    '\t\tBounceCode:  event.BounceReason,\n',
-    '\t}\n',
-    '\n',
-]
+new_block_1 = (
+    '\tpayload := &models.WebhookPayload{\n'
+    '\t\tEvent:      models.WebhookEventType(event.EventType),\n'
+    '\t\tTimestamp:   event.Timestamp,\n'
+    '\t\tMessageID:   event.MessageID.String(),\n'
+    '\t\tRecipient:   event.Recipient,\n'
+    '\t\tUserAgent:   event.UserAgent,\n'
+    '\t\tIPAddress:   event.IPAddress,\n'
+    '\t\tURL:         event.URL,\n'
+    '\t\tBounceType:  event.BounceType,\n'
+    '\t\tBounceCode:  event.BounceReason,\n'
+    '\t}\n'
+    '\n'
+)
 
 # Replace lines 140 through 157 (0-indexed, exclusive end)
-lines[140:158] = new_block_1
-
-# Fix 2: Find testPayload construction (line numbers shifted after fix 1)
-for i, line in enumerate(lines):
-    if 'testPayload := &models.WebhookPayload{' in line:
-        # Find the closing brace of this struct literal
-        j = i + 1
-        brace_depth = 1
-        while j < len(lines):
-            for ch in lines[j]:
-                if ch == '{':
-                    brace_depth += 1
-                elif ch == '}':
-                    brace_depth -= 1
-            if brace_depth == 0:
-                break
-            j += 1
-        j += 1  # include the closing brace line
-        new_block_2 = [
-            '\ttestPayload := &models.WebhookPayload{\n',
-            '\t\tEvent:     "test",\n',
-            '\t\tTimestamp: time.Now(),\n',
-            '\t\tMessageID: uuid.New().String(),\n',
-            '\t\tRecipient: "test@example.com",\n',
-            '\t\tReason:    "This is a test webhook delivery",\n',
-            '\t}\n',
-        ]
-        lines[i:j] = new_block_2
-        print(f"Fixed testPayload at lines {i+1}-{j}")
-        break
-
-with open(filepath, 'w') as f:
-    f.writelines(lines)
-
-print("Done - both payload constructions fixed")
+start = line_offset(text, 140)
+end = start + line_offset(text[start:], 18)
+text = text[:start] + new_block_1 + text[end:]
+
+# Fix 2: Find testPayload construction (offsets shifted after fix 1)
+anchor_text = 'testPayload := &models.WebhookPayload{'
+anchor = text.find(anchor_text)
+if anchor >= 0:
+    # Jump straight to the closing brace of this struct literal, then take
+    # the whole line it sits on
+    start = text.rfind('\n', 0, anchor) + 1
+    end = line_end(text, block_end(text, anchor + len(anchor_text) - 1))
+    new_block_2 = (
+        '\ttestPayload := &models.WebhookPayload{\n'
+        '\t\tEvent:     "test",\n'
+        '\t\tTimestamp: time.Now(),\n'
+        '\t\tMessageID: uuid.New().String(),\n'
+        '\t\tRecipient: "test@example.com",\n'
+        '\t\tReason:    "This is a test webhook delivery",\n'
+        '\t}\n'
+    )
+    first = text.count('\n', 0, start) + 1
+    print(f"Fixed testPayload at lines {first}-{first + text.count(chr(10), start, end) - 1}")
+    text = text[:start] + new_block_2 + text[end:]
+
+if write_if_changed(filepath, text, original):
+    print("Done - both payload constructions fixed")
+else:
+    print("Payload constructions already fixed")
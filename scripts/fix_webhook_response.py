@@ -1,37 +1,32 @@
-filepath = '/opt/oonrumail/app/services/transactional-api/models/webhook.go'
-
-with open(filepath, 'r') as f:
-    lines = f.readlines()
-
-# Remove the mangled WebhookResponse that was just appended
-# Find where the bad one starts
-start_idx = None
-for i, line in enumerate(lines):
-    if '// WebhookResponse is the API response' in line:
-        start_idx = i
-        break
+from _fileio import read_text, write_if_changed
 
-if start_idx is not None:
-    lines = lines[:start_idx]
+filepath = '/opt/oonrumail/app/services/transactional-api/models/webhook.go'
 
-bt = chr(96)  # backtick
+MARKER = '// WebhookResponse is the API response'
 
-webhook_response = f"""
+WEBHOOK_RESPONSE = """
 // WebhookResponse is the API response for a webhook
-type WebhookResponse struct {{
-\tID            uuid.UUID          {bt}json:"id"{bt}
-\tURL           string             {bt}json:"url"{bt}
-\tEvents        []WebhookEventType {bt}json:"events"{bt}
-\tIsActive      bool               {bt}json:"is_active"{bt}
-\tSecret        string             {bt}json:"secret,omitempty"{bt}
-\tFailureCount  int                {bt}json:"failure_count"{bt}
-\tLastTriggered *time.Time         {bt}json:"last_triggered,omitempty"{bt}
-\tCreatedAt     time.Time          {bt}json:"created_at"{bt}
-}}
+type WebhookResponse struct {
+\tID            uuid.UUID          `json:"id"`
+\tURL           string             `json:"url"`
+\tEvents        []WebhookEventType `json:"events"`
+\tIsActive      bool               `json:"is_active"`
+\tSecret        string             `json:"secret,omitempty"`
+\tFailureCount  int                `json:"failure_count"`
+\tLastTriggered *time.Time         `json:"last_triggered,omitempty"`
+\tCreatedAt     time.Time          `json:"created_at"`
+}
 """
 
-with open(filepath, 'w') as f:
-    f.writelines(lines)
-    f.write(webhook_response)
+text = original = read_text(filepath)
+
+# Remove the mangled WebhookResponse that was just appended
+# Find where the bad one starts and drop everything from that line on
+start = text.find(MARKER)
+if start >= 0:
+    text = text[:text.rfind('\n', 0, start) + 1]
 
-print("Added WebhookResponse with proper formatting")
+if write_if_changed(filepath, text + WEBHOOK_RESPONSE, original):
+    print("Added WebhookResponse with proper formatting")
+else:
+    print("WebhookResponse already properly formatted")
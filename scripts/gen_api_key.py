@@ -1,34 +1,76 @@
 #!/usr/bin/env python3
-"""Generate an API key and insert into database"""
+"""Generate an API key and insert into database
+
+Usage: gen_api_key.py [--count N]
+"""
+import argparse
+import base64
 import hashlib
 import secrets
-import string
 
-# Generate a secure API key
+
+def random_alnum(n):
+    """n uniformly random [A-Za-z0-9] characters.
+
+    Base64 of random bytes is uniform over 64 symbols; dropping '+' and '/'
+    leaves it uniform over the 62 alphanumerics. One CSPRNG read almost
+    always yields enough characters, so this replaces n secrets.choice calls.
+    """
+    out = b''
+    while len(out) < n:
+        out += base64.b64encode(secrets.token_bytes(n * 3 // 2)).translate(None, b'+/')
+    return out[:n].decode('ascii')
+
+
+def positive_int(value):
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--count", type=positive_int, default=1, help="number of keys to generate (default: 1)")
+args = parser.parse_args()
+
+# Generate secure API keys
 prefix = "sk_live_"
-random_part = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(32))
-api_key = prefix + random_part
-key_prefix = api_key[:12]
 
-# Hash for storage
-key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+# Every key starts with the same prefix, so hash it once and fork the state
+# per key with copy() instead of re-hashing the prefix bytes each time
+prefix_hash = hashlib.sha256(prefix.encode('ascii'))
 
-print(f"API_KEY={api_key}")
-print(f"KEY_PREFIX={key_prefix}")
-print(f"KEY_HASH={key_hash}")
-print()
-print("SQL to insert:")
-print(f"""
-INSERT INTO api_keys (id, domain_id, key_hash, key_prefix, name, scopes, rate_limit, daily_limit, created_by)
-VALUES (
+rows = []
+for n in range(1, args.count + 1):
+    random_part = random_alnum(32)
+    api_key = prefix + random_part
+    key_prefix = api_key[:12]
+
+    # Hash for storage
+    h = prefix_hash.copy()
+    h.update(random_part.encode('ascii'))
+    key_hash = h.hexdigest()
+
+    # Numbered names in bulk mode; the single-key output is unchanged
+    var, name = (f"_{n}", f"admin-key-{n}") if args.count > 1 else ("", "admin-key")
+    print(f"API_KEY{var}={api_key}")
+    print(f"KEY_PREFIX{var}={key_prefix}")
+    print(f"KEY_HASH{var}={key_hash}")
+    rows.append(f"""(
     gen_random_uuid(),
     '00000000-0000-0000-0000-000000000002',
     '{key_hash}',
     '{key_prefix}',
-    'admin-key',
+    '{name}',
     ARRAY['send', 'read', 'manage'],
     10000,
     1000000,
     '00000000-0000-0000-0000-000000000001'
-);
+)""")
+
+print()
+print("SQL to insert:")
+print(f"""
+INSERT INTO api_keys (id, domain_id, key_hash, key_prefix, name, scopes, rate_limit, daily_limit, created_by)
+VALUES {', '.join(rows)};
 """)
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 import urllib.request, json
 
+LOGIN_BODY = json.dumps({'email':'admin@oonrumail.com','password':'SecurePassword123!'}).encode()
+
 req = urllib.request.Request('http://localhost:8082/api/auth/login',
-    data=json.dumps({'email':'admin@oonrumail.com','password':'SecurePassword123!'}).encode(),
+    data=LOGIN_BODY,
     headers={'Content-Type':'application/json'}, method='POST')
 resp = urllib.request.urlopen(req)
 data = json.loads(resp.read())
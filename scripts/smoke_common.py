@@ -0,0 +1,235 @@
+"""Shared helpers and phases for the smoke test scripts.
+
+smoke_test_v2/v3 import from here and keep only the phases that differ
+between them (auth token handling, the v3-only endpoint set and SMTP send
+test). final_smoke_test.py, find_api_paths.py and the top-level
+smoke_test.py reuse the JSON codec and the keep-alive request helper.
+"""
+import atexit
+import http.client
+import io
+import urllib.parse
+import json
+import socket
+import ssl
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# orjson is much faster when installed; fall back to stdlib json otherwise.
+# Both take bytes in loads() and give bytes from dumps(), so response and
+# request bodies never need a separate UTF-8 decode/encode pass.
+try:
+    import orjson
+    dumps, loads = orjson.dumps, orjson.loads
+except ImportError:
+    def dumps(obj):
+        return json.dumps(obj).encode()
+    loads = json.loads
+
+BASE_URL = "http://localhost"
+results = []
+COUNTS = Counter()  # status -> number of results, kept current by log()
+
+# Report lines collect here and reach stdout in a single write at exit
+# (including an exit by exception). When stdout is redirected, FAIL lines
+# are also echoed to stderr as they happen so a slow run isn't silent; on a
+# terminal that echo would just print every failure twice.
+OUT = io.StringIO()
+ECHO_FAILS = not sys.stdout.isatty()
+
+def out(*args):
+    print(*args, file=OUT)
+
+@atexit.register
+def _flush_report():
+    sys.stdout.write(OUT.getvalue())
+    sys.stdout.flush()
+
+# Header dicts are built once and shared; nothing below mutates them
+KEEPALIVE_HEADERS = {"Connection": "keep-alive"}
+JSON_HEADERS = {**KEEPALIVE_HEADERS, "Content-Type": "application/json"}
+pool = ThreadPoolExecutor(max_workers=16)
+
+HEALTH_CHECKS = [
+    ("Auth",             f"{BASE_URL}:8082/health"),
+    ("Contacts",         f"{BASE_URL}:8083/health"),
+    ("Domain Manager",   f"{BASE_URL}:8084/health"),
+    ("Storage",          f"{BASE_URL}:8085/health"),
+    ("Chat",             f"{BASE_URL}:8086/health"),
+    ("SMS Gateway",      f"{BASE_URL}:8087/health"),
+    ("AI Assistant",     f"{BASE_URL}:8090/health"),
+    ("Calendar",         f"{BASE_URL}:8092/health"),
+    ("Transactional API",f"{BASE_URL}:8095/health"),
+]
+
+# (label, port, bytes the greeting must contain)
+BANNER_CHECKS = [
+    ("SMTP (587)", 587, b"220"),
+    ("SMTP (25)",  25,  b"220"),
+    ("IMAP (143)", 143, b"OK"),
+]
+
+# Only the two string fields vary between logins, so splice their JSON
+# encodings into a fixed byte template rather than dumping a fresh dict
+LOGIN_BODY_TEMPLATE = b'{"email":%s,"password":%s}'
+
+def login_body(email, password):
+    return LOGIN_BODY_TEMPLATE % (dumps(email), dumps(password))
+
+def log(test, status, detail=""):
+    icon = "✅" if status == "PASS" else "❌" if status == "FAIL" else "⚠️"
+    results.append((test, status, detail))
+    COUNTS[status] += 1
+    line = f"  {icon} {test}: {detail}"
+    out(line)
+    if status == "FAIL" and ECHO_FAILS:
+        print(line, file=sys.stderr, flush=True)
+
+def classify(status, pass_codes=frozenset({200}), warn_codes=frozenset({401})):
+    """PASS/WARN/FAIL verdict for an HTTP status from its expected code sets."""
+    return "PASS" if status in pass_codes else "WARN" if status in warn_codes else "FAIL"
+
+def phase(title):
+    out(f"\n📋 {title}")
+    out("-" * 50)
+
+# https targets use self-signed certs, so verification is off
+TLS_CONTEXT = ssl.create_default_context()
+TLS_CONTEXT.check_hostname = False
+TLS_CONTEXT.verify_mode = ssl.CERT_NONE
+
+# One keep-alive connection per (thread, scheme, host, port) so repeated calls
+# to a service skip the TCP (and, for https, TLS) handshake. http.client
+# connections are not thread-safe, hence the thread-local cache.
+_conns = threading.local()
+
+def get_conn(scheme, host, port, timeout=10):
+    conns = _conns.__dict__.setdefault("by_port", {})
+    key = (scheme, host, port)
+    c = conns.get(key)
+    if c is None:
+        if scheme == "https":
+            c = http.client.HTTPSConnection(host, port, timeout=timeout, context=TLS_CONTEXT)
+        else:
+            c = http.client.HTTPConnection(host, port, timeout=timeout)
+        conns[key] = c
+    return c
+
+def http_request(method, url, body=None, headers=None, timeout=10):
+    """Send one request over the pooled connection; return (status, raw bytes)."""
+    u = urllib.parse.urlsplit(url)
+    path = u.path + (f"?{u.query}" if u.query else "")
+    h = {**KEEPALIVE_HEADERS, **headers} if headers else KEEPALIVE_HEADERS
+    for attempt in range(2):
+        c = get_conn(u.scheme, u.hostname, u.port or (443 if u.scheme == "https" else 80), timeout)
+        try:
+            c.request(method, path, body=body, headers=h)
+            r = c.getresponse()
+            return r.status, r.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # Server dropped the idle keep-alive socket; reconnect once
+            c.close()
+            if attempt:
+                raise
+        except Exception:
+            # A failed connect leaves the connection mid-request; reset it so
+            # the next call on this thread doesn't fail with CannotSendRequest
+            c.close()
+            raise
+
+def http_get(url, headers=None, timeout=10):
+    try:
+        status, body = http_request("GET", url, headers=headers, timeout=timeout)
+        return status, body.decode()
+    except Exception as e:
+        return 0, str(e)
+
+@lru_cache(maxsize=64)
+def _cached_get(url, headers):
+    return http_get(url, dict(headers) if headers else None)
+
+def http_get_cached(url, headers=None):
+    """http_get memoized per (url, headers) for the rest of the run.
+
+    Only for idempotent checks such as health endpoints that several phases
+    report on; never for auth calls or anything that is polled for change.
+    """
+    return _cached_get(url, tuple(sorted(headers.items())) if headers else ())
+
+def http_post(url, data, headers=None, timeout=10):
+    # data may be pre-encoded JSON bytes or anything json.dumps accepts
+    body = data if isinstance(data, bytes) else dumps(data)
+    h = {**JSON_HEADERS, **headers} if headers else JSON_HEADERS
+    try:
+        status, raw = http_request("POST", url, body, h, timeout)
+    except Exception as e:
+        return 0, {"error": str(e)}
+    try:
+        return status, loads(raw) if raw else {}
+    except ValueError:
+        return status, {"raw": raw[:300].decode(errors='replace')}
+
+def check_tcp(host, port, expect, timeout=5):
+    """Connect and check the server greeting contains expect (bytes).
+
+    SMTP/IMAP greetings are well under 128 bytes, so that's all we read; the
+    match runs on the raw bytes and only the part we report gets decoded.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as s:
+            banner = s.recv(128)
+    except Exception as e:
+        return False, str(e)
+    return expect in banner, banner.strip()[:80].decode('ascii', errors='replace')
+
+def print_banner(title):
+    out("=" * 70)
+    out(f"  {title}")
+    out("=" * 70)
+
+def run_health_phase():
+    phase("PHASE 1: Service Health Checks")
+    # Fire all checks at once; results come back in submission order
+    responses = pool.map(lambda hc: http_get_cached(hc[1]), HEALTH_CHECKS)
+    for (name, url), (status, body) in zip(HEALTH_CHECKS, responses):
+        if status == 200:
+            log(f"{name} Health", "PASS", f"HTTP {status}")
+        else:
+            log(f"{name} Health", "FAIL", f"HTTP {status}: {body[:100]}")
+
+def run_banner_phase():
+    phase("PHASE 2: Protocol Banners (SMTP/IMAP)")
+    for label, port, expect in BANNER_CHECKS:
+        ok, banner = check_tcp("localhost", port, expect)
+        log(label, "PASS" if ok else "FAIL", banner[:80])
+
+def print_summary(list_warnings=False):
+    pool.shutdown()
+
+    out("\n" + "=" * 70)
+    out("  SMOKE TEST SUMMARY")
+    out("=" * 70)
+
+    passed, failed, warned = COUNTS["PASS"], COUNTS["FAIL"], COUNTS["WARN"]
+    total = len(results)
+
+    out(f"\n  ✅ Passed: {passed}/{total}")
+    if warned:
+        out(f"  ⚠️  Warnings: {warned}")
+    if failed:
+        out(f"  ❌ Failed: {failed}")
+        out("\n  Failed tests:")
+        for name, status, detail in results:
+            if status == "FAIL":
+                out(f"    - {name}: {detail}")
+    if warned and list_warnings:
+        out("\n  Warning tests:")
+        for name, status, detail in results:
+            if status == "WARN":
+                out(f"    - {name}: {detail}")
+
+    out(f"\n  Overall: {'🟢 PLATFORM OPERATIONAL' if failed == 0 else '🟡 PARTIALLY OPERATIONAL' if failed < total//2 else '🔴 CRITICAL ISSUES'}")
+    out("=" * 70)
@@ -1,31 +1,54 @@
 #!/usr/bin/env python3
 """Quick auth test after schema migration"""
-import urllib.request
+import http.client
 import json
 import ssl
 
 ctx = ssl._create_unverified_context()
-base = "http://localhost:8082/api/auth"
+base = "/api/auth"
+# All calls go to the same service, so share one keep-alive connection
+conn = http.client.HTTPConnection("localhost", 8082, timeout=10)
 
-def post(path, data):
-    req = urllib.request.Request(
-        f"{base}{path}",
-        data=json.dumps(data).encode(),
-        headers={"Content-Type": "application/json"},
-        method="POST"
-    )
+# The credentials are fixed, so encode each request body once up front
+REGISTER_BODY = json.dumps({
+    "email": "admin@oonrumail.com",
+    "password": "SecurePassword123!",
+    "name": "Admin User"
+}).encode()
+LOGIN_BODY = json.dumps({
+    "email": "admin@oonrumail.com",
+    "password": "SecurePassword123!"
+}).encode()
+
+def post(path, body, retry=False):
+    """POST body to the auth service and print the outcome.
+
+    retry resends once if the server dropped the idle keep-alive socket; only
+    pass it for requests that are safe to repeat (a register could otherwise
+    land twice).
+    """
+    headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
     try:
-        resp = urllib.request.urlopen(req, timeout=10)
+        for attempt in range(2):
+            try:
+                conn.request("POST", f"{base}{path}", body=body, headers=headers)
+                resp = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if attempt or not retry:
+                    raise
         body = resp.read().decode()
         print(f"  Status: {resp.status}")
-        print(f"  Body: {body[:500]}")
+        if resp.status < 400:
+            print(f"  Body: {body[:500]}")
+        else:
+            print(f"  Error: {body[:500]}")
         return resp.status, json.loads(body) if body else {}
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        print(f"  Status: {e.code}")
-        print(f"  Error: {body[:500]}")
-        return e.code, json.loads(body) if body else {}
     except Exception as e:
+        # Reset the half-used connection so the next test starts clean instead
+        # of failing with CannotSendRequest ('Request-sent')
+        conn.close()
         print(f"  Exception: {e}")
         return 0, {}
 
@@ -35,18 +58,11 @@ print("=" * 60)
 
 # Test 1: Register
 print("\n1. Register new user (admin@oonrumail.com)...")
-status, data = post("/register", {
-    "email": "admin@oonrumail.com",
-    "password": "SecurePassword123!",
-    "name": "Admin User"
-})
+status, data = post("/register", REGISTER_BODY)
 
 # Test 2: Login
 print("\n2. Login with new user...")
-status, data = post("/login", {
-    "email": "admin@oonrumail.com",
-    "password": "SecurePassword123!"
-})
+status, data = post("/login", LOGIN_BODY, retry=True)
 
 if status == 200 and "token" in str(data):
     print("\n✅ AUTH IS WORKING!")
@@ -55,11 +71,7 @@ else:
 
 # Test 3: Try registering duplicate
 print("\n3. Register duplicate (should fail)...")
-status, data = post("/register", {
-    "email": "admin@oonrumail.com",
-    "password": "SecurePassword123!",
-    "name": "Admin User"
-})
+status, data = post("/register", REGISTER_BODY)
 
 print("\n" + "=" * 60)
 print("DONE")
@@ -1,147 +1,240 @@
 #!/usr/bin/env python3
 """End-to-end smoke test for OONRUMAIL platform."""
+import io
 import json
-import urllib.request
-import urllib.error
-import ssl
+import smtplib
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from email.generator import BytesGenerator
+from email.mime.text import MIMEText
+from email.policy import SMTP as SMTP_POLICY
+
+# JSON codec (orjson when installed) and the keep-alive request helper are
+# shared with the scripts/ smoke tests
+from scripts.smoke_common import dumps, http_request, loads
+
+# Literal loopback address rather than "localhost": skips a getaddrinfo/NSS
+# lookup per connection and any ::1-first dual-stack fallback
+HOST = "127.0.0.1"
+BASE = f"http://{HOST}"
+
+SMOKE_FROM = "smoketest@oonrumail.com"
+SMOKE_TO = "testrecipient@oonrumail.com"
+
+# (section title, port) for every service whose /health the smoke test checks
+SERVICES = (
+    ("CONTACTS SERVICE", 8083),
+    ("CALENDAR SERVICE", 8092),
+    ("CHAT SERVICE", 8086),
+    ("STORAGE SERVICE", 8085),
+    ("DOMAIN MANAGER", 8084),
+    ("AI ASSISTANT", 8090),
+    ("TRANSACTIONAL API", 8095),
+    ("SMS GATEWAY", 8087),
+)
+
+@lru_cache(maxsize=32)
+def health_url(port):
+    return f"{BASE}:{port}/health"
 
-# Disable SSL verification for self-signed certs
-ctx = ssl.create_default_context()
-ctx.check_hostname = False
-ctx.verify_mode = ssl.CERT_NONE
+MAILPIT_URL = f"{BASE}:8025/api/v1/messages"
 
-BASE = "http://localhost"
+# The auth payloads are fixed, so encode them once
+REGISTER_BODY = dumps({
+    "email": "smoketest@oonrumail.com",
+    "password": "SmokeTest12345!",
+    "name": "Smoke Test User"
+})
+LOGIN_BODY = dumps({
+    "email": "smoketest@oonrumail.com",
+    "password": "SmokeTest12345!"
+})
+
+def api_raw(method, url, raw_body=None, headers=None, timeout=10):
+    """Like api() but sends raw_body, already-encoded JSON bytes, as-is."""
+    if raw_body is not None:
+        headers = {**(headers or {}), 'Content-Type': 'application/json'}
+    try:
+        status, raw = http_request(method, url, raw_body, headers, timeout)
+    except Exception as e:
+        return 0, str(e)
+    try:
+        return status, loads(raw)
+    except ValueError:
+        # JSONDecodeError from json or orjson, or a body that isn't UTF-8
+        return status, raw.decode('utf-8', errors='replace')
 
 def api(method, url, data=None, headers=None, timeout=10):
     """Make an HTTP request and return (status, body_dict)."""
-    if headers is None:
-        headers = {}
-    if data is not None:
-        data = json.dumps(data).encode('utf-8')
-        headers['Content-Type'] = 'application/json'
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    raw_body = None if data is None else dumps(data)
+    return api_raw(method, url, raw_body, headers, timeout)
+
+class Client:
+    """Holds the auth token and sends it on every request made through it."""
+
+    def __init__(self):
+        self.token = None
+        self.headers = {}
+
+    def auth(self, url, raw_body):
+        """POST pre-encoded credentials and adopt the returned token, if any."""
+        status, body = api_raw("POST", url, raw_body)
+        if isinstance(body, dict):
+            token = body.get("token") or body.get("access_token")
+            if token:
+                self.token = token
+                self.headers = {"Authorization": f"Bearer {token}"}
+        return status, body
+
+    def request(self, method, url, data=None):
+        return api(method, url, data, self.headers)
+
+def probe_banner(host, port, timeout=5):
+    """Connect and return the server's greeting line; raises on failure."""
+    s = socket.create_connection((host, port), timeout=timeout)
     try:
-        resp = urllib.request.urlopen(req, timeout=timeout)
-        body = resp.read().decode('utf-8')
-        try:
-            return resp.status, json.loads(body)
-        except:
-            return resp.status, body
-    except urllib.error.HTTPError as e:
-        body = e.read().decode('utf-8')
+        return s.recv(1024).decode()
+    finally:
+        s.close()
+
+def build_raw_message():
+    """Serialize the smoke test email to wire-format bytes (CRLF line ends)."""
+    msg = MIMEText("This is a smoke test email from OONRUMAIL platform.")
+    msg["Subject"] = "OONRUMAIL Smoke Test"
+    msg["From"] = SMOKE_FROM
+    msg["To"] = SMOKE_TO
+    buf = io.BytesIO()
+    BytesGenerator(buf, policy=SMTP_POLICY).flatten(msg)
+    return buf.getvalue()
+
+# Built once; any number of sends reuse the same bytes without re-flattening
+RAW_MSG = build_raw_message()
+
+def mailpit_total(body):
+    """Message count from a Mailpit /messages response, or None if unusable."""
+    if isinstance(body, dict):
+        return body.get("total", body.get("messages_count", 0))
+    return None
+
+def wait_for_mailpit(expected, deadline=3.0):
+    """Poll Mailpit until it holds at least `expected` messages.
+
+    Waits 0.1s, 0.2s, 0.4s, ... (capped at 1s) between polls so a fast
+    delivery is seen almost immediately, and gives up once the next wait
+    would pass `deadline` seconds. Returns the last (status, body).
+    """
+    start = time.monotonic()
+    delay = 0.1
+    while True:
+        status, body = api("GET", MAILPIT_URL)
+        total = mailpit_total(body)
+        if (total is not None and total >= expected) or time.monotonic() - start + delay > deadline:
+            return status, body
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+@contextmanager
+def smtp_client(host=HOST, port=587, timeout=10):
+    """One SMTP session (connect + EHLO) for any number of sends; QUITs on exit."""
+    smtp = smtplib.SMTP(host, port, timeout=timeout)
+    try:
+        smtp.ehlo()
+        yield smtp
+    finally:
         try:
-            return e.code, json.loads(body)
-        except:
-            return e.code, body
-    except Exception as e:
-        return 0, str(e)
+            smtp.quit()
+        except smtplib.SMTPException:
+            # Session already broken; don't mask the original error
+            smtp.close()
+
+# Serializes report blocks so results printed from pool workers can't interleave
+_out_lock = threading.Lock()
 
 def test(name, status, body, expected_status=None):
     ok = True
     if expected_status and status != expected_status:
         ok = False
     icon = "✅" if ok else "⚠️"
-    print(f"\n{icon} {name}")
-    print(f"   Status: {status}")
+    # Format the whole block first, then emit it with a single write
+    buf = io.StringIO()
+    buf.write(f"\n{icon} {name}\n")
+    buf.write(f"   Status: {status}\n")
     if isinstance(body, dict):
-        print(f"   Response: {json.dumps(body, indent=2)[:500]}")
+        buf.write(f"   Response: {json.dumps(body, indent=2)[:500]}\n")
     else:
-        print(f"   Response: {str(body)[:300]}")
+        buf.write(f"   Response: {str(body)[:300]}\n")
+    with _out_lock:
+        sys.stdout.write(buf.getvalue())
     return ok
 
 print("=" * 60)
 print("OONRUMAIL Platform End-to-End Smoke Test")
 print("=" * 60)
 
+# Health checks and banner probes don't depend on auth, so fire them all now
+# and let them run while we register/login; each section below just collects
+# its own result
+pool = ThreadPoolExecutor(max_workers=16)
+health = {port: pool.submit(api, "GET", health_url(port)) for _, port in SERVICES}
+banners = {port: pool.submit(probe_banner, HOST, port) for port in (587, 143)}
+# Baseline for the delivery check, taken well before anything is sent
+mailpit_before = pool.submit(api, "GET", MAILPIT_URL)
+
 # ---- 1. Register a user ----
 print("\n--- AUTH SERVICE (port 8082) ---")
-status, body = api("POST", f"{BASE}:8082/api/auth/register", {
-    "email": "smoketest@oonrumail.com",
-    "password": "SmokeTest12345!",
-    "name": "Smoke Test User"
-})
+client = Client()
+status, body = client.auth(f"{BASE}:8082/api/auth/register", REGISTER_BODY)
 test("Register User", status, body)
 
-token = None
 user_id = None
 if isinstance(body, dict):
-    token = body.get("token") or body.get("access_token")
     user_id = body.get("user", {}).get("id") if isinstance(body.get("user"), dict) else body.get("user_id")
 
 # ---- 2. Login ----
-status, body = api("POST", f"{BASE}:8082/api/auth/login", {
-    "email": "smoketest@oonrumail.com",
-    "password": "SmokeTest12345!"
-})
-test("Login", status, body)
+# Only needed if register didn't already hand back a token; skipping it saves
+# a round-trip and a password hash check on the auth service
+if client.token:
+    print("\n(register returned a token; skipping login)")
+else:
+    status, body = client.auth(f"{BASE}:8082/api/auth/login", LOGIN_BODY)
+    test("Login", status, body)
 
-if isinstance(body, dict):
-    token = body.get("token") or body.get("access_token") or token
-    if isinstance(body.get("user"), dict):
+    if isinstance(body, dict) and isinstance(body.get("user"), dict):
         user_id = body["user"].get("id") or user_id
 
-auth_header = {"Authorization": f"Bearer {token}"} if token else {}
-
-# ---- 3. Get profile ----
-if token:
-    status, body = api("GET", f"{BASE}:8082/api/auth/me", headers=auth_header)
-    test("Get Profile", status, body)
-
-# ---- 4. Contacts Service ----
-print("\n--- CONTACTS SERVICE (port 8083) ---")
-status, body = api("GET", f"{BASE}:8083/health")
-test("Health Check", status, body, 200)
-
-if token:
-    status, body = api("POST", f"{BASE}:8083/api/v1/contacts", {
-        "first_name": "John",
-        "last_name": "Doe",
-        "email": "john@example.com"
-    }, headers=auth_header)
-    test("Create Contact", status, body)
-
-# ---- 5. Calendar Service ----
-print("\n--- CALENDAR SERVICE (port 8092) ---")
-status, body = api("GET", f"{BASE}:8092/health")
-test("Health Check", status, body, 200)
-
-# ---- 6. Chat Service ----
-print("\n--- CHAT SERVICE (port 8086) ---")
-status, body = api("GET", f"{BASE}:8086/health")
-test("Health Check", status, body, 200)
-
-# ---- 7. Storage Service ----
-print("\n--- STORAGE SERVICE (port 8085) ---")
-status, body = api("GET", f"{BASE}:8085/health")
-test("Health Check", status, body, 200)
-
-# ---- 8. Domain Manager ----
-print("\n--- DOMAIN MANAGER (port 8084) ---")
-status, body = api("GET", f"{BASE}:8084/health")
-test("Health Check", status, body, 200)
-
-# ---- 9. AI Assistant ----
-print("\n--- AI ASSISTANT (port 8090) ---")
-status, body = api("GET", f"{BASE}:8090/health")
-test("Health Check", status, body, 200)
-
-# ---- 10. Transactional API ----
-print("\n--- TRANSACTIONAL API (port 8095) ---")
-status, body = api("GET", f"{BASE}:8095/health")
-test("Health Check", status, body, 200)
-
-# ---- 11. SMS Gateway ----
-print("\n--- SMS GATEWAY (port 8087) ---")
-status, body = api("GET", f"{BASE}:8087/health")
-test("Health Check", status, body, 200)
+# ---- 3. Authenticated calls ----
+# Everything here needs the token, so it's skipped as one unit when auth
+# failed instead of each call checking; the calls themselves run in parallel
+# Each result is still reported in its own service's section, as before
+authed = {}
+if client.token:
+    authed = {
+        "Get Profile": pool.submit(client.request, "GET", f"{BASE}:8082/api/auth/me"),
+        "Create Contact": pool.submit(client.request, "POST", f"{BASE}:8083/api/v1/contacts", {
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "john@example.com"
+        }),
+    }
+    test("Get Profile", *authed["Get Profile"].result())
+
+# ---- 4-11. Service health checks ----
+for title, port in SERVICES:
+    print(f"\n--- {title} (port {port}) ---")
+    status, body = health[port].result()
+    test("Health Check", status, body, 200)
+    if port == 8083 and authed:
+        test("Create Contact", *authed["Create Contact"].result())
 
 # ---- 12. SMTP Test ----
 print("\n--- SMTP SERVICE (port 25/587) ---")
-import socket
 try:
-    s = socket.create_connection(("localhost", 587), timeout=5)
-    banner = s.recv(1024).decode()
-    s.close()
+    banner = banners[587].result()
     test("SMTP Banner (587)", 200, banner, 200)
 except Exception as e:
     test("SMTP Connect (587)", 0, str(e))
@@ -149,46 +242,41 @@ except Exception as e:
 # ---- 13. IMAP Test ----
 print("\n--- IMAP SERVICE (port 143/993) ---")
 try:
-    s = socket.create_connection(("localhost", 143), timeout=5)
-    banner = s.recv(1024).decode()
-    s.close()
+    banner = banners[143].result()
     test("IMAP Banner (143)", 200, banner, 200)
 except Exception as e:
     test("IMAP Connect (143)", 0, str(e))
 
 # ---- 14. Send test email via SMTP ----
 print("\n--- EMAIL SEND TEST ---")
-import smtplib
-from email.mime.text import MIMEText
+baseline = mailpit_total(mailpit_before.result()[1]) or 0
+sent = False
 try:
-    msg = MIMEText("This is a smoke test email from OONRUMAIL platform.")
-    msg["Subject"] = "OONRUMAIL Smoke Test"
-    msg["From"] = "smoketest@oonrumail.com"
-    msg["To"] = "testrecipient@oonrumail.com"
-
-    smtp = smtplib.SMTP("localhost", 587, timeout=10)
-    smtp.ehlo()
     # Don't STARTTLS for now, just test basic send
-    smtp.sendmail("smoketest@oonrumail.com", ["testrecipient@oonrumail.com"], msg.as_string())
-    smtp.quit()
+    with smtp_client() as smtp:
+        smtp.sendmail(SMOKE_FROM, [SMOKE_TO], RAW_MSG)
+    sent = True
     test("Send Email via SMTP", 200, "Email sent successfully!", 200)
 except Exception as e:
     test("Send Email via SMTP", 0, str(e))
 
 # ---- 15. Check Mailpit for received email ----
 print("\n--- MAILPIT (port 8025) ---")
-status, body = api("GET", f"{BASE}:8025/api/v1/messages")
-if isinstance(body, dict):
-    count = body.get("total", body.get("messages_count", 0))
+# Wait for the new message only if one was actually sent
+status, body = wait_for_mailpit(baseline + 1 if sent else 0)
+count = mailpit_total(body)
+if count is not None:
     test(f"Mailpit Messages (total: {count})", status, body, 200)
 else:
     test("Mailpit Messages", status, body)
 
+pool.shutdown()
+
 # ---- Summary ----
 print("\n" + "=" * 60)
 print("Smoke test complete!")
-if token:
-    print(f"✅ Auth token obtained: {token[:30]}...")
+if client.token:
+    print(f"✅ Auth token obtained: {client.token[:30]}...")
 else:
     print("⚠️  No auth token obtained - authenticated tests skipped")
 print("=" * 60)